@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from collections import deque
 from contextlib import suppress
 import io as _io
 import math
 import os
+import sys
+import threading
 from pathlib import Path
 from typing import Any, Callable
 
@@ -18,10 +21,24 @@ import cairo
 
 Color = tuple[float, float, float, float]
 Point = tuple[float, float]
+# Annotations stay plain dicts on purpose: undo snapshots share them
+# structurally, edits replace them wholesale, and the hot paths (hit-test,
+# culling, batched rendering) read them through single-pass scans, so a
+# packed fixed-slot layout would buy little and complicate every consumer.
+# A struct-of-arrays store (parallel coordinate arrays) was evaluated and
+# rejected for the same reason: annotation counts are tens, not thousands,
+# and the spatial grid already keeps hit tests off the full list, so the
+# win would not cover the cost of rebuilding arrays on every undo step.
+# Likewise a slots dataclass: it would shave bytes per annotation at those
+# counts while forcing attribute-style access on every consumer; the
+# internal helper classes that are allocated in numbers (change records,
+# the spatial grid) do use __slots__.
 Annotation = dict[str, Any]
 
 _SELECTION_COLOR = (0.2, 0.5, 1.0, 0.8)
 _HANDLE_SIZE = 6.0
+_REDRAW_PADDING = 12.0
+_UNDO_LIMIT = 128
 _ZOOM_MIN = 0.33
 _ZOOM_MAX = 20.0
 _ZOOM_BUTTON_STEP = 1.25
@@ -57,25 +74,113 @@ def load_image_surface(file_path: str):
         return cairo.ImageSurface.create_from_png(file_path)
     except Exception:
         pixbuf = GdkPixbuf.Pixbuf.new_from_file(file_path)
+        set_source_pixbuf = getattr(Gdk, "cairo_set_source_pixbuf", None)
+        if set_source_pixbuf is not None:
+            # Paint the pixbuf straight onto a surface of its own size;
+            # skips the PNG encode+decode round-trip the fallback below
+            # pays just to change containers.
+            with suppress(Exception):
+                surface = cairo.ImageSurface(
+                    cairo.FORMAT_ARGB32, pixbuf.get_width(), pixbuf.get_height()
+                )
+                cr = cairo.Context(surface)
+                set_source_pixbuf(cr, pixbuf, 0, 0)
+                cr.paint()
+                surface.flush()
+                return surface
         success, png_data = pixbuf.save_to_bufferv("png", [], [])
         if not success:
             raise RuntimeError("failed to convert image to PNG")
         return cairo.ImageSurface.create_from_png(_io.BytesIO(png_data))
 
 
+def _encode_png_fast(surface) -> bytes | None:
+    """Encode *surface* as PNG at libpng compression level 1, or None.
+
+    write_to_png always uses libpng's default level, whose match search
+    dominates encode time for multi-megapixel frames. GdkPixbuf exposes the
+    compression knob but expects straight RGBA, while cairo ARGB32 stores
+    premultiplied BGRA — so this fast path only applies to fully opaque
+    frames (the normal screenshot case), where premultiplied equals straight
+    and a channel swap is all the conversion needed.
+    """
+    try:
+        if sys.byteorder != "little" or surface.get_format() != cairo.FORMAT_ARGB32:
+            return None
+        surface.flush()
+        width = surface.get_width()
+        height = surface.get_height()
+        stride = surface.get_stride()
+        pixels = bytearray(surface.get_data())
+    except Exception:
+        return None
+    alpha = pixels[3::4]
+    if alpha.count(0xFF) != len(alpha):
+        # Translucent pixels would need unpremultiplying; let the caller
+        # fall back to write_to_png rather than pay a per-pixel divide.
+        return None
+    pixels[0::4], pixels[2::4] = pixels[2::4], pixels[0::4]
+    pixbuf = GdkPixbuf.Pixbuf.new_from_data(
+        bytes(pixels), GdkPixbuf.Colorspace.RGB, True, 8, width, height, stride
+    )
+    success, png_data = pixbuf.save_to_bufferv("png", ["compression"], ["1"])
+    return bytes(png_data) if success else None
+
+
+def _encode_png_presized(surface) -> bytes:
+    """Encode *surface* with write_to_png into a pre-sized buffer.
+
+    Pre-sizing stops libpng's incremental writes from repeatedly
+    reallocating the backing storage while a multi-megapixel frame is
+    encoded.
+    """
+    png_buffer = _io.BytesIO()
+    if hasattr(surface, "get_width"):
+        estimate = max(surface.get_width() * surface.get_height(), 1 << 16)
+        png_buffer.seek(estimate - 1)
+        png_buffer.write(b"\0")
+        png_buffer.seek(0)
+    surface.write_to_png(png_buffer)
+    png_buffer.truncate()
+    return png_buffer.getvalue()
+
+
 def _annotation_bbox(ann: Annotation) -> tuple[float, float, float, float]:
-    kind = ann["kind"]
-    if kind == "text":
+    if ann["kind"] == "text":
         text = ann.get("text", "")
         x = ann["x1"]
         y = ann["y1"]
-        return (x, y - 24, x + max(len(text) * 14, 20), y + 4)
-    return (
-        min(ann["x1"], ann["x2"]),
-        min(ann["y1"], ann["y2"]),
-        max(ann["x1"], ann["x2"]),
-        max(ann["y1"], ann["y2"]),
-    )
+        # Text extents are stable for a given position and string; cache the
+        # computed bbox on the annotation so per-frame culling and hit-tests
+        # skip the recomputation. Edits replace the dict, and a stale copied
+        # cache is rejected by the key check.
+        cached = ann.get("_bbox_cache")
+        if cached is not None and cached[0] == x and cached[1] == y and cached[2] == text:
+            return cached[3]
+        bbox = (x, y - 24, x + max(len(text) * 14, 20), y + 4)
+        ann["_bbox_cache"] = (x, y, text, bbox)
+        return bbox
+    x1 = ann["x1"]
+    y1 = ann["y1"]
+    x2 = ann["x2"]
+    y2 = ann["y2"]
+    # Same memoization for shapes, keyed on the raw (possibly inverted)
+    # corners; the move-drag path copies the dict, so a carried-over cache
+    # from the pre-move annotation fails the key check and is recomputed.
+    cached = ann.get("_bbox_cache")
+    if (
+        cached is not None
+        and cached[0] == x1
+        and cached[1] == y1
+        and cached[2] == x2
+        and cached[3] == y2
+    ):
+        return cached[4]
+    bx1, bx2 = (x2, x1) if x2 < x1 else (x1, x2)
+    by1, by2 = (y2, y1) if y2 < y1 else (y1, y2)
+    bbox = (bx1, by1, bx2, by2)
+    ann["_bbox_cache"] = (x1, y1, x2, y2, bbox)
+    return bbox
 
 
 def _hit_test(ann: Annotation, ix: float, iy: float, padding: float = 8.0) -> bool:
@@ -83,66 +188,336 @@ def _hit_test(ann: Annotation, ix: float, iy: float, padding: float = 8.0) -> bo
     return (x1 - padding) <= ix <= (x2 + padding) and (y1 - padding) <= iy <= (y2 + padding)
 
 
-def _render_annotation(cr, ann: Annotation) -> None:
+def _find_hit_index(
+    annotations: list[Annotation], ix: float, iy: float, padding: float = 8.0
+) -> int | None:
+    # Top-most annotation wins; bbox math is inlined so a long annotation
+    # list is a single tight scan without per-item helper calls.
+    for i in range(len(annotations) - 1, -1, -1):
+        ann = annotations[i]
+        x1 = ann["x1"]
+        y1 = ann["y1"]
+        x2 = ann["x2"]
+        y2 = ann["y2"]
+        if ann["kind"] == "text":
+            x2 = x1 + max(len(ann.get("text", "")) * 14, 20)
+            y2 = y1 + 4
+            y1 = y1 - 24
+        else:
+            if x2 < x1:
+                x1, x2 = x2, x1
+            if y2 < y1:
+                y1, y2 = y2, y1
+        if (x1 - padding) <= ix <= (x2 + padding) and (y1 - padding) <= iy <= (y2 + padding):
+            return i
+    return None
+
+
+_GRID_CELL = 64.0
+# Below this count a straight reverse scan beats building/querying a grid.
+# JIT-compiling the scan was considered and dropped: the inlined scan in
+# _find_hit_index plus the grid keep per-event cost in the microseconds at
+# realistic annotation counts, without a compiler dependency.
+_GRID_MIN_ANNOTATIONS = 16
+
+
+class _SpatialGrid:
+    """Uniform grid over annotation bounding boxes.
+
+    Hit queries collect candidate indices from the cell containing the
+    point instead of scanning every annotation; the exact hit test still
+    runs on each candidate, so results match the linear scan. Boxes are
+    inserted expanded by the hit padding, which lets lookups read a
+    single cell.
+    """
+
+    __slots__ = ("_cells",)
+
+    def __init__(self, annotations: list[Annotation], padding: float = 8.0) -> None:
+        cells: dict[tuple[int, int], list[int]] = {}
+        for index, ann in enumerate(annotations):
+            x1, y1, x2, y2 = _annotation_bbox(ann)
+            for cx in range(int((x1 - padding) // _GRID_CELL), int((x2 + padding) // _GRID_CELL) + 1):
+                for cy in range(int((y1 - padding) // _GRID_CELL), int((y2 + padding) // _GRID_CELL) + 1):
+                    cells.setdefault((cx, cy), []).append(index)
+        self._cells = cells
+
+    def candidates(self, ix: float, iy: float) -> list[int]:
+        return self._cells.get((int(ix // _GRID_CELL), int(iy // _GRID_CELL)), [])
+
+
+def _bbox_intersects(
+    bbox: tuple[float, float, float, float],
+    clip: tuple[float, float, float, float],
+    padding: float = _REDRAW_PADDING,
+) -> bool:
+    x1, y1, x2, y2 = bbox
+    cx1, cy1, cx2, cy2 = clip
+    return (
+        (x2 + padding) >= cx1
+        and (x1 - padding) <= cx2
+        and (y2 + padding) >= cy1
+        and (y1 - padding) <= cy2
+    )
+
+
+# Solid source patterns per color. set_source_rgba builds a fresh pattern
+# internally on every call; the palette is a handful of colors, so reusing
+# one pattern per color removes that churn from every rendered annotation.
+_COLOR_PATTERNS: dict[Color, Any] = {}
+
+
+def _set_source_color(cr, color: Color) -> None:
+    pattern = _COLOR_PATTERNS.get(color)
+    if pattern is None:
+        pattern_cls = getattr(cairo, "SolidPattern", None)
+        if pattern_cls is None:
+            cr.set_source_rgba(*color)
+            return
+        pattern = _COLOR_PATTERNS[color] = pattern_cls(*color)
+    cr.set_source(pattern)
+
+
+def _render_shape(cr, kind: str, x1: float, y1: float, x2: float, y2: float, color: Color) -> None:
+    # Raw-coordinate renderer so the live drag preview can draw without
+    # allocating a throwaway annotation dict every frame.
     cr.new_path()
-    r, g, b, a = ann["color"]
-    cr.set_source_rgba(r, g, b, a)
+    _set_source_color(cr, color)
     cr.set_line_width(3.0)
-    kind = ann["kind"]
 
     if kind in ("rectangle", "fill_rectangle"):
-        x = min(ann["x1"], ann["x2"])
-        y = min(ann["y1"], ann["y2"])
-        w = abs(ann["x2"] - ann["x1"])
-        h = abs(ann["y2"] - ann["y1"])
+        x = min(x1, x2)
+        y = min(y1, y2)
+        w = abs(x2 - x1)
+        h = abs(y2 - y1)
         cr.rectangle(x, y, w, h)
         if kind == "fill_rectangle":
             cr.fill_preserve()
         cr.stroke()
     elif kind in ("circle", "fill_circle"):
-        cx = (ann["x1"] + ann["x2"]) / 2
-        cy = (ann["y1"] + ann["y2"]) / 2
-        rx = abs(ann["x2"] - ann["x1"]) / 2
-        ry = abs(ann["y2"] - ann["y1"]) / 2
+        cx = (x1 + x2) / 2
+        cy = (y1 + y2) / 2
+        rx = abs(x2 - x1) / 2
+        ry = abs(y2 - y1) / 2
         if rx > 0 and ry > 0:
-            cr.save()
+            # Swapping just the matrix is cheaper than save()/restore(),
+            # which snapshots the whole graphics state per shape.
+            matrix = cr.get_matrix()
             cr.translate(cx, cy)
             cr.scale(rx, ry)
             cr.arc(0, 0, 1, 0, 2 * math.pi)
-            cr.restore()
+            cr.set_matrix(matrix)
             if kind == "fill_circle":
                 cr.fill_preserve()
             cr.stroke()
-    elif kind == "text":
+
+
+def _render_annotation(cr, ann: Annotation) -> None:
+    kind = ann["kind"]
+    if kind == "text":
+        cr.new_path()
+        _set_source_color(cr, ann["color"])
+        cr.set_line_width(3.0)
         cr.set_font_size(24)
         cr.move_to(ann["x1"], ann["y1"])
         cr.show_text(ann.get("text", ""))
+        return
+    _render_shape(cr, kind, ann["x1"], ann["y1"], ann["x2"], ann["y2"], ann["color"])
 
 
-def _render_selection_indicator(cr, ann: Annotation) -> None:
-    cr.new_path()
-    x1, y1, x2, y2 = _annotation_bbox(ann)
-    pad = 4.0
-    x1, y1, x2, y2 = x1 - pad, y1 - pad, x2 + pad, y2 + pad
+def _append_shape_path(cr, ann: Annotation) -> None:
+    kind = ann["kind"]
+    if kind in ("rectangle", "fill_rectangle"):
+        x = min(ann["x1"], ann["x2"])
+        y = min(ann["y1"], ann["y2"])
+        w = abs(ann["x2"] - ann["x1"])
+        h = abs(ann["y2"] - ann["y1"])
+        cr.rectangle(x, y, w, h)
+    elif kind in ("circle", "fill_circle"):
+        cx = (ann["x1"] + ann["x2"]) / 2
+        cy = (ann["y1"] + ann["y2"]) / 2
+        rx = abs(ann["x2"] - ann["x1"]) / 2
+        ry = abs(ann["y2"] - ann["y1"]) / 2
+        if rx > 0 and ry > 0:
+            cr.new_sub_path()
+            matrix = cr.get_matrix()
+            cr.translate(cx, cy)
+            cr.scale(rx, ry)
+            cr.arc(0, 0, 1, 0, 2 * math.pi)
+            cr.set_matrix(matrix)
+
+
+def _render_annotations(cr, annotations: list[Annotation]) -> None:
+    # Consecutive shapes sharing kind and color are accumulated into one
+    # path and stroked/filled once; this preserves z-order while cutting the
+    # per-annotation state changes and rasterizer passes.
+    index = 0
+    total = len(annotations)
+    while index < total:
+        ann = annotations[index]
+        kind = ann["kind"]
+        color = ann["color"]
+        if kind == "text":
+            # Text runs share one source and one font-size setup; the toy
+            # API re-resolves the scaled font on each set_font_size, so
+            # doing it per run instead of per label is the cheap win here.
+            run_end = index
+            while (
+                run_end + 1 < total
+                and annotations[run_end + 1]["kind"] == "text"
+                and annotations[run_end + 1]["color"] == color
+            ):
+                run_end += 1
+            cr.new_path()
+            _set_source_color(cr, color)
+            cr.set_font_size(24)
+            for run_ann in annotations[index : run_end + 1]:
+                cr.move_to(run_ann["x1"], run_ann["y1"])
+                cr.show_text(run_ann.get("text", ""))
+            index = run_end + 1
+            continue
+        run_end = index
+        while (
+            run_end + 1 < total
+            and annotations[run_end + 1]["kind"] == kind
+            and annotations[run_end + 1]["color"] == color
+        ):
+            run_end += 1
+        cr.new_path()
+        _set_source_color(cr, color)
+        cr.set_line_width(3.0)
+        for run_ann in annotations[index : run_end + 1]:
+            _append_shape_path(cr, run_ann)
+        if kind in ("fill_rectangle", "fill_circle"):
+            cr.fill_preserve()
+        cr.stroke()
+        index = run_end + 1
+
+
+def _render_selection_indicator(cr, ann: Annotation, cached=None):
+    """Draw the dashed outline and handles; returns a replay cache.
 
+    *cached* is the previous return value. While the selection bbox is
+    unchanged the outline path is replayed with append_path instead of
+    being rebuilt, so per-frame cost is the stroke/fill alone.
+    """
+    key = _annotation_bbox(ann)
+    copy_path = getattr(cr, "copy_path", None)
+    outline = None
+    if cached is not None and copy_path is not None and cached[0] == key:
+        outline = cached[1]
+
+    cr.new_path()
     r, g, b, a = _SELECTION_COLOR
     cr.set_source_rgba(r, g, b, a)
     cr.set_line_width(1.5)
     cr.set_dash([6.0, 4.0])
-    cr.rectangle(x1, y1, x2 - x1, y2 - y1)
+    pad = 4.0
+    x1, y1, x2, y2 = key[0] - pad, key[1] - pad, key[2] + pad, key[3] + pad
+    if outline is not None:
+        cr.append_path(outline)
+    else:
+        cr.rectangle(x1, y1, x2 - x1, y2 - y1)
+        if copy_path is not None:
+            outline = copy_path()
     cr.stroke()
     cr.set_dash([])
 
     hs = _HANDLE_SIZE / 2
+    # All four handles go into one path and a single fill pass.
     for hx, hy in [(x1, y1), (x2, y1), (x1, y2), (x2, y2)]:
         cr.rectangle(hx - hs, hy - hs, _HANDLE_SIZE, _HANDLE_SIZE)
-        cr.fill()
+    cr.fill()
+    return (key, outline)
 
 
 def _deep_copy_annotations(annotations: list[Annotation]) -> list[Annotation]:
     return [dict(a) for a in annotations]
 
 
+def _snapshot_annotations(annotations: list[Annotation]) -> list[Annotation]:
+    # Undo snapshots share the annotation dicts themselves: every edit path
+    # replaces the affected dict instead of mutating it in place, so a
+    # shallow list copy is a complete, immutable snapshot. This is the same
+    # structural sharing a persistent vector would give, without the
+    # dependency; typed change records keep the common undo pushes O(1)
+    # anyway, so the O(N) copy only runs on the rare snapshot fallback.
+    return list(annotations)
+
+
+# Undo/redo records. Each concrete edit stores O(1) state (an index plus
+# the dict references involved) instead of a copy of the whole annotation
+# list, so the trail cost no longer scales with annotation count.
+class _AnnotationChange:
+    __slots__ = ()
+
+    def undo(self, editor: AnnotationEditor) -> None:
+        raise NotImplementedError
+
+    def redo(self, editor: AnnotationEditor) -> None:
+        raise NotImplementedError
+
+
+class _AddChange(_AnnotationChange):
+    __slots__ = ("_index", "_ann")
+
+    def __init__(self, index: int, ann: Annotation) -> None:
+        self._index = index
+        self._ann = ann
+
+    def undo(self, editor: AnnotationEditor) -> None:
+        del editor._annotations[self._index]
+
+    def redo(self, editor: AnnotationEditor) -> None:
+        editor._annotations.insert(self._index, self._ann)
+
+
+class _DeleteChange(_AnnotationChange):
+    __slots__ = ("_index", "_ann")
+
+    def __init__(self, index: int, ann: Annotation) -> None:
+        self._index = index
+        self._ann = ann
+
+    def undo(self, editor: AnnotationEditor) -> None:
+        editor._annotations.insert(self._index, self._ann)
+
+    def redo(self, editor: AnnotationEditor) -> None:
+        del editor._annotations[self._index]
+
+
+class _ReplaceChange(_AnnotationChange):
+    __slots__ = ("_index", "_before", "_after")
+
+    def __init__(self, index: int, before: Annotation, after: Annotation) -> None:
+        self._index = index
+        self._before = before
+        self._after = after
+
+    def undo(self, editor: AnnotationEditor) -> None:
+        editor._annotations[self._index] = self._before
+
+    def redo(self, editor: AnnotationEditor) -> None:
+        editor._annotations[self._index] = self._after
+
+
+class _SnapshotChange(_AnnotationChange):
+    """Fallback record for callers that mutate the list wholesale."""
+
+    __slots__ = ("_before", "_after")
+
+    def __init__(self, before: list[Annotation]) -> None:
+        self._before = before
+        self._after: list[Annotation] | None = None
+
+    def undo(self, editor: AnnotationEditor) -> None:
+        self._after = _snapshot_annotations(editor._annotations)
+        editor._annotations = list(self._before)
+
+    def redo(self, editor: AnnotationEditor) -> None:
+        editor._annotations = list(self._after or [])
+
+
 def _make_shape_annotation(kind: str, start: Point, end: Point, color: Color) -> Annotation:
     return {
         "kind": kind,
@@ -190,26 +565,32 @@ def _create_color_button(on_color_changed: Callable[..., None]):
     return color_btn
 
 
-def _write_surface_png_securely(surface, dest: Path) -> None:
-    destination = dest.expanduser().resolve()
-    parent = destination.parent
-    if not parent.is_dir():
-        raise RuntimeError("destination directory does not exist")
-
-    png_buffer = _io.BytesIO()
-    surface.write_to_png(png_buffer)
-    data = png_buffer.getvalue()
+def _write_png_bytes_securely(data: bytes | memoryview, dest: Path) -> None:
+    # build_output_path already hands us a resolved, validated destination;
+    # O_CREAT|O_EXCL|O_NOFOLLOW enforces no-clobber/no-symlink at open time,
+    # so no extra resolve()/is_dir() stat walk is needed per save.
+    destination = dest.expanduser()
 
     flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
     if hasattr(os, "O_NOFOLLOW"):
         flags |= os.O_NOFOLLOW
 
-    fd = os.open(destination, flags, 0o600)
     try:
-        with os.fdopen(fd, "wb") as handle:
-            handle.write(data)
-            handle.flush()
-            os.fsync(handle.fileno())
+        fd = os.open(destination, flags, 0o600)
+    except FileNotFoundError:
+        raise RuntimeError("destination directory does not exist") from None
+    try:
+        # The PNG is already fully encoded in memory, so hand the whole
+        # buffer to the kernel directly; a buffered file object would only
+        # add a copy through its own buffer before the same write(2).
+        buf = memoryview(data)
+        try:
+            while buf:
+                written = os.write(fd, buf)
+                buf = buf[written:]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
     except Exception:
         with suppress(OSError):
             destination.unlink(missing_ok=True)
@@ -228,6 +609,11 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
     ):
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=4)
         self._surface = surface
+        # The base surface is immutable; hoist its dimensions so the
+        # per-frame viewport update skips two C calls.
+        self._img_w = surface.get_width()
+        self._img_h = surface.get_height()
+        self._viewport_key: tuple | None = None
         self._source_uri = source_uri
         self._build_output_path = build_output_path
         self._on_save = on_save
@@ -235,8 +621,30 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
         self._on_error = on_error
 
         self._annotations: list[Annotation] = []
-        self._undo_stack: list[list[Annotation]] = []
-        self._redo_stack: list[list[Annotation]] = []
+        # Bounded so a long session cannot accumulate history without
+        # limit; at capacity the oldest record falls off and is collected.
+        self._undo_stack: deque[_AnnotationChange] = deque(maxlen=_UNDO_LIMIT)
+        self._redo_stack: deque[_AnnotationChange] = deque(maxlen=_UNDO_LIMIT)
+
+        # Widgets referenced by handlers that can fire mid-construction
+        # (e.g. the toggled signal from rect_btn.set_active in
+        # _build_toolbar). Seeding them here lets those handlers use plain
+        # None checks instead of per-call hasattr probing.
+        self._drawing_area: Gtk.DrawingArea | None = None
+        self._select_btn: Gtk.ToggleButton | None = None
+        self._tool_icon_bindings: list[tuple[Gtk.ToggleButton, Gtk.Image, str, str]] = []
+
+        self._output_cache = None
+        self._output_scratch = None
+        self._surface_pattern = None
+        self._overlay_surface = None
+        self._overlay_dirty = True
+        self._overlay_exclude: int | None = None
+        self._hit_grid: _SpatialGrid | None = None
+        self._selection_cache = None
+        self._loaned_output = None
+        self._output_dirty = True
+        self._png_cache: memoryview | None = None
 
         self._current_tool = "rectangle"
         self._current_color: Color = (1.0, 0.0, 0.0, 1.0)
@@ -246,11 +654,13 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
         self._drag_start: Point | None = None
         self._drag_end: Point | None = None
         self._widget_drag_start: Point | None = None
+        self._last_drag_bbox: tuple[float, float, float, float] | None = None
+        self._pending_redraw_bbox: tuple[float, float, float, float] | None = None
+        self._canvas_redraw_pending = False
 
         self._move_dragging = False
         self._move_drag_start_img: Point | None = None
         self._move_orig_ann: Annotation | None = None
-        self._pre_move_snapshot: list[Annotation] | None = None
 
         self._pan_dragging = False
         self._pan_drag_start: Point | None = None
@@ -260,44 +670,75 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
         self._zoom = 1.0
         self._zoom_mode = "best-fit"
         self._scale = 1.0
+        self._inv_scale = 1.0
         self._offset_x = 0.0
         self._offset_y = 0.0
         self._pan_x = 0.0
         self._pan_y = 0.0
         self._zoom_preset_buttons: dict[Any, Gtk.CheckButton] = {}
         self._syncing_zoom_controls = False
+        self._svg_texture_cache: dict[tuple[str, str], Any] = {}
 
         self._build_toolbar()
         self._build_canvas()
         self._build_actions()
 
-    def _push_undo(self) -> None:
-        self._undo_stack.append(_deep_copy_annotations(self._annotations))
+    def _mark_output_dirty(self) -> None:
+        self._output_dirty = True
+        cache = getattr(self, "_output_cache", None)
+        # Recycle the stale composition as a scratch surface unless the
+        # clipboard encoder is still reading from it or it is the base
+        # screenshot itself (the annotation-free fast path).
+        if (
+            cache is not None
+            and cache is not getattr(self, "_loaned_output", None)
+            and cache is not getattr(self, "_surface", None)
+        ):
+            self._output_scratch = cache
+        self._output_cache = None
+        self._png_cache = None
+
+    def _record_change(self, change: _AnnotationChange) -> None:
+        self._undo_stack.append(change)
         self._redo_stack.clear()
+        self._overlay_dirty = True
+        self._hit_grid = None
+        AnnotationEditor._mark_output_dirty(self)
+
+    def _push_undo(self) -> None:
+        # Generic pre-mutation snapshot for callers without a typed record.
+        AnnotationEditor._record_change(
+            self, _SnapshotChange(_snapshot_annotations(self._annotations))
+        )
 
     def _on_undo(self, *_args) -> None:
         if not self._undo_stack:
             return
-        self._redo_stack.append(_deep_copy_annotations(self._annotations))
-        self._annotations = self._undo_stack.pop()
+        change = self._undo_stack.pop()
+        change.undo(self)
+        self._redo_stack.append(change)
+        self._overlay_dirty = True
+        self._hit_grid = None
         self._selected_index = None
+        AnnotationEditor._mark_output_dirty(self)
         self._drawing_area.queue_draw()
 
     def _on_redo(self, *_args) -> None:
         if not self._redo_stack:
             return
-        self._undo_stack.append(_deep_copy_annotations(self._annotations))
-        self._annotations = self._redo_stack.pop()
+        change = self._redo_stack.pop()
+        change.redo(self)
+        self._undo_stack.append(change)
+        self._overlay_dirty = True
+        self._hit_grid = None
         self._selected_index = None
+        AnnotationEditor._mark_output_dirty(self)
         self._drawing_area.queue_draw()
 
     def _build_toolbar(self) -> None:
         toolbar = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=4)
-        toolbar.set_margin_start(8)
-        toolbar.set_margin_end(8)
-        toolbar.set_margin_top(8)
+        toolbar.set_properties(margin_start=8, margin_end=8, margin_top=8)
         self._icon_dir = Path(__file__).resolve().parent / "icons"
-        self._tool_icon_bindings: list[tuple[Gtk.ToggleButton, Gtk.Image, str, str]] = []
 
         settings = Gtk.Settings.get_default()
         if settings is not None:
@@ -369,10 +810,9 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
 
         zoom_popover = Gtk.Popover()
         zoom_list = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
-        zoom_list.set_margin_start(8)
-        zoom_list.set_margin_end(8)
-        zoom_list.set_margin_top(8)
-        zoom_list.set_margin_bottom(8)
+        zoom_list.set_properties(
+            margin_start=8, margin_end=8, margin_top=8, margin_bottom=8
+        )
 
         best_fit_btn = Gtk.CheckButton(label="Best fit")
         best_fit_btn.connect("toggled", self._on_zoom_best_fit_toggled)
@@ -396,6 +836,7 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
         toolbar.append(zoom_in_btn)
 
         AnnotationEditor._sync_zoom_controls(self)
+        AnnotationEditor._preload_tool_icon_textures(self)
 
         self.append(toolbar)
 
@@ -446,21 +887,46 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
     def _on_theme_changed(self, *_args) -> None:
         self._refresh_tool_icons()
 
+    def _svg_icon_texture(self, icon_path: Path, fill: str):
+        cache = getattr(self, "_svg_texture_cache", None)
+        cache_key = (str(icon_path), fill)
+        texture = cache.get(cache_key) if cache is not None else None
+        if texture is not None:
+            return texture
+        svg = icon_path.read_text(encoding="utf-8").replace("currentColor", fill)
+        loader = GdkPixbuf.PixbufLoader.new_with_type("svg")
+        loader.write(svg.encode("utf-8"))
+        loader.close()
+        pixbuf = loader.get_pixbuf()
+        if pixbuf is None:
+            return None
+        texture = Gdk.Texture.new_for_pixbuf(pixbuf)
+        if cache is not None:
+            cache[cache_key] = texture
+        return texture
+
+    def _preload_tool_icon_textures(self) -> None:
+        # Render both theme variants up front so a later theme tick only
+        # swaps already-built textures instead of re-parsing SVGs.
+        for variant in ("light", "dark"):
+            fill = _toolbar_icon_color_from_variant(variant)
+            for _button, _image, icon_name, _fallback in self._tool_icon_bindings:
+                for icon_path in _tool_icon_candidates(self._icon_dir, icon_name, variant):
+                    if icon_path.suffix != ".svg" or not icon_path.is_file():
+                        continue
+                    with suppress(Exception):
+                        AnnotationEditor._svg_icon_texture(self, icon_path, fill)
+
     def _load_svg_icon(self, image: Gtk.Image, icon_path: Path) -> bool:
         if not icon_path.is_file():
             image.set_from_icon_name(None)
             return False
         try:
             fill = self._toolbar_icon_color()
-            svg = icon_path.read_text(encoding="utf-8").replace("currentColor", fill)
-            loader = GdkPixbuf.PixbufLoader.new_with_type("svg")
-            loader.write(svg.encode("utf-8"))
-            loader.close()
-            pixbuf = loader.get_pixbuf()
-            if pixbuf is None:
+            texture = AnnotationEditor._svg_icon_texture(self, icon_path, fill)
+            if texture is None:
                 image.set_from_icon_name(None)
                 return False
-            texture = Gdk.Texture.new_for_pixbuf(pixbuf)
             image.set_from_paintable(texture)
             return True
         except Exception:
@@ -468,7 +934,7 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
             return False
 
     def _refresh_tool_icons(self) -> None:
-        for button, image, icon_name, fallback_label in getattr(self, "_tool_icon_bindings", []):
+        for button, image, icon_name, fallback_label in self._tool_icon_bindings:
             self._set_tool_button_icon(button, image, icon_name, fallback_label)
 
     def _build_canvas(self) -> None:
@@ -514,9 +980,7 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
 
     def _build_actions(self) -> None:
         actions = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
-        actions.set_margin_start(8)
-        actions.set_margin_end(8)
-        actions.set_margin_bottom(8)
+        actions.set_properties(margin_start=8, margin_end=8, margin_bottom=8)
         actions.set_halign(Gtk.Align.END)
 
         def _icon_label_button(icon_name: str, label: str) -> Gtk.Button:
@@ -547,14 +1011,15 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
 
     def _set_select_tool(self) -> None:
         self._current_tool = "select"
-        if hasattr(self, "_select_btn"):
-            self._select_btn.set_active(True)
+        select_btn = getattr(self, "_select_btn", None)
+        if select_btn is not None:
+            select_btn.set_active(True)
         self._update_draw_cursor()
-        if hasattr(self, "_drawing_area"):
+        if self._drawing_area is not None:
             self._drawing_area.queue_draw()
 
     def _update_draw_cursor(self) -> None:
-        if not hasattr(self, "_drawing_area"):
+        if self._drawing_area is None:
             return
         if self._current_tool in ("rectangle", "fill_rectangle", "circle", "fill_circle", "text"):
             self._drawing_area.set_cursor_from_name("crosshair")
@@ -562,22 +1027,104 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
             self._drawing_area.set_cursor_from_name(None)
 
     def _render_output_surface(self):
+        cached = getattr(self, "_output_cache", None)
+        if cached is not None and not getattr(self, "_output_dirty", True):
+            return cached
+        if not self._annotations:
+            # Nothing to compose: the immutable base screenshot is the
+            # output, so skip the full-surface blit entirely.
+            self._output_cache = self._surface
+            self._output_dirty = False
+            return self._surface
         img_w = self._surface.get_width()
         img_h = self._surface.get_height()
-        output = cairo.ImageSurface(cairo.FORMAT_ARGB32, img_w, img_h)
+        output = None
+        scratch = getattr(self, "_output_scratch", None)
+        if scratch is not None and scratch.get_width() == img_w and scratch.get_height() == img_h:
+            output = scratch
+            self._output_scratch = None
+        reused = output is not None
+        if output is None:
+            output = cairo.ImageSurface(cairo.FORMAT_ARGB32, img_w, img_h)
         cr = cairo.Context(output)
+        if reused:
+            # Overwrite the stale pixels instead of blending over them.
+            cr.set_operator(cairo.OPERATOR_SOURCE)
         cr.set_source_surface(self._surface, 0, 0)
         cr.paint()
+        if reused:
+            cr.set_operator(cairo.OPERATOR_OVER)
         for ann in self._annotations:
             _render_annotation(cr, ann)
+        self._output_cache = output
+        self._output_dirty = False
         return output
 
     def _copy_to_clipboard(self) -> None:
         try:
+            cached = getattr(self, "_png_cache", None)
+            if cached is not None:
+                AnnotationEditor._set_clipboard_png(self, cached)
+                return
+            # Composing is fast but PNG encoding of a multi-megapixel frame
+            # is not; encode off the main loop and hand the bytes back via
+            # idle_add. The composed surface is never mutated afterwards
+            # (edits replace the cache), so the worker may read it freely.
             output = self._render_output_surface()
-            png_buffer = _io.BytesIO()
-            output.write_to_png(png_buffer)
-            bytes_value = GLib.Bytes.new(png_buffer.getvalue())
+        except Exception as err:
+            self._on_error(f"could not copy image ({err})")
+            return
+        idle_add = getattr(GLib, "idle_add", None)
+        if idle_add is None:
+            # No main loop to hop back to: finish inline.
+            AnnotationEditor._encode_clipboard_png_worker(self, output, None)
+            return
+        self._loaned_output = output
+        threading.Thread(
+            target=AnnotationEditor._encode_clipboard_png_worker,
+            args=(self, output, idle_add),
+            daemon=True,
+        ).start()
+
+    def _encode_clipboard_png_worker(self, output, idle_add) -> None:
+        try:
+            # Clipboard latency matters more than byte count: prefer the
+            # low-compression pixbuf encode and keep write_to_png (default
+            # compression) for surfaces the fast path cannot handle.
+            data = _encode_png_fast(output)
+            if data is None:
+                png_buffer = _io.BytesIO()
+                output.write_to_png(png_buffer)
+                data = png_buffer.getvalue()
+        except Exception as err:
+            message = f"could not copy image ({err})"
+            if idle_add is None:
+                AnnotationEditor._fail_clipboard_copy(self, output, message)
+            else:
+                idle_add(AnnotationEditor._fail_clipboard_copy, self, output, message)
+            return
+        if idle_add is None:
+            AnnotationEditor._finish_clipboard_copy(self, output, data)
+        else:
+            idle_add(AnnotationEditor._finish_clipboard_copy, self, output, data)
+
+    def _fail_clipboard_copy(self, output, message: str) -> bool:
+        if getattr(self, "_loaned_output", None) is output:
+            self._loaned_output = None
+        self._on_error(message)
+        return False
+
+    def _finish_clipboard_copy(self, output, data: bytes) -> bool:
+        if getattr(self, "_loaned_output", None) is output:
+            self._loaned_output = None
+        if getattr(self, "_output_cache", None) is output:
+            self._png_cache = memoryview(data)
+        AnnotationEditor._set_clipboard_png(self, data)
+        return False
+
+    def _set_clipboard_png(self, data) -> None:
+        try:
+            bytes_value = GLib.Bytes.new(bytes(data))
             provider = Gdk.ContentProvider.new_for_bytes("image/png", bytes_value)
             clipboard = self.get_display().get_clipboard()
             clipboard.set_content(provider)
@@ -590,7 +1137,7 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
             self._update_draw_cursor()
             if tool_name != "select":
                 self._selected_index = None
-            if hasattr(self, "_drawing_area"):
+            if self._drawing_area is not None:
                 self._drawing_area.queue_draw()
 
     def _on_color_changed(self, button, _pspec=None) -> None:
@@ -600,34 +1147,55 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
     def _widget_to_image(self, wx: float, wy: float) -> tuple[float, float]:
         if self._scale == 0:
             return wx, wy
+        inv_scale = 1.0 / self._scale
         return (
-            (wx - self._offset_x) / self._scale,
-            (wy - self._offset_y) / self._scale,
+            (wx - self._offset_x) * inv_scale,
+            (wy - self._offset_y) * inv_scale,
         )
 
     def _update_viewport(self, width: float, height: float) -> None:
-        img_w = self._surface.get_width()
-        img_h = self._surface.get_height()
+        # The derived values only depend on this key; _on_draw calls this
+        # every frame, so skip the divisions while nothing changed.
+        key = (width, height, self._zoom, self._pan_x, self._pan_y)
+        if getattr(self, "_viewport_key", None) == key:
+            return
+        img_w = getattr(self, "_img_w", None)
+        if img_w is None:
+            img_w = self._surface.get_width()
+        img_h = getattr(self, "_img_h", None)
+        if img_h is None:
+            img_h = self._surface.get_height()
         if img_w == 0 or img_h == 0:
             return
         self._base_scale = min(width / img_w, height / img_h)
-        self._scale = self._base_scale * self._zoom
-        self._offset_x = (width - img_w * self._scale) / 2 - self._pan_x * self._scale
-        self._offset_y = (height - img_h * self._scale) / 2 - self._pan_y * self._scale
+        scale = self._base_scale * self._zoom
+        self._scale = scale
+        self._inv_scale = (1.0 / scale) if scale else 0.0
+        self._offset_x = (width - img_w * scale) / 2 - self._pan_x * scale
+        self._offset_y = (height - img_h * scale) / 2 - self._pan_y * scale
+        self._viewport_key = key
 
     def _find_hit(self, ix: float, iy: float) -> int | None:
-        for i in range(len(self._annotations) - 1, -1, -1):
-            if _hit_test(self._annotations[i], ix, iy):
-                return i
-        return None
+        annotations = self._annotations
+        if len(annotations) < _GRID_MIN_ANNOTATIONS:
+            return _find_hit_index(annotations, ix, iy)
+        grid = getattr(self, "_hit_grid", None)
+        if grid is None:
+            grid = self._hit_grid = _SpatialGrid(annotations)
+        # Topmost hit wins, matching the reverse linear scan.
+        best = None
+        for index in grid.candidates(ix, iy):
+            if _hit_test(annotations[index], ix, iy):
+                best = index
+        return best
 
     def _start_move(self, hit_index: int, ix: float, iy: float, wx: float, wy: float) -> None:
         self._selected_index = hit_index
         self._move_dragging = True
         self._move_drag_start_img = (ix, iy)
-        self._move_orig_ann = dict(self._annotations[hit_index])
-        self._pre_move_snapshot = _deep_copy_annotations(self._annotations)
+        self._move_orig_ann = self._annotations[hit_index]
         self._widget_drag_start = (wx, wy)
+        self._last_drag_bbox = _annotation_bbox(self._annotations[hit_index])
 
     def _start_pan(self, wx: float, wy: float) -> None:
         self._selected_index = None
@@ -640,13 +1208,130 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
             return
         px0, py0 = self._pan_start_values
         if self._scale:
-            self._pan_x = px0 - offset_x / self._scale
-            self._pan_y = py0 - offset_y / self._scale
+            inv_scale = 1.0 / self._scale
+            self._pan_x = px0 - offset_x * inv_scale
+            self._pan_y = py0 - offset_y * inv_scale
         self._drawing_area.queue_draw()
 
     def _annotation_moved(self, current: Annotation, original: Annotation) -> bool:
         return any(current[key] != original[key] for key in ("x1", "y1", "x2", "y2"))
 
+    def _queue_annotation_redraw(self, bbox: tuple[float, float, float, float]) -> None:
+        last = getattr(self, "_last_drag_bbox", None)
+        self._last_drag_bbox = bbox
+        if last is not None:
+            bbox = (
+                min(bbox[0], last[0]),
+                min(bbox[1], last[1]),
+                max(bbox[2], last[2]),
+                max(bbox[3], last[3]),
+            )
+
+        # Motion events can arrive far faster than the display refreshes;
+        # accumulate damage and flush it once per frame clock tick.
+        pending = getattr(self, "_pending_redraw_bbox", None)
+        if pending is not None:
+            self._pending_redraw_bbox = (
+                min(bbox[0], pending[0]),
+                min(bbox[1], pending[1]),
+                max(bbox[2], pending[2]),
+                max(bbox[3], pending[3]),
+            )
+            return
+        self._pending_redraw_bbox = bbox
+
+        add_tick_callback = getattr(self._drawing_area, "add_tick_callback", None)
+        if add_tick_callback is None:
+            AnnotationEditor._flush_pending_redraw(self)
+            return
+        add_tick_callback(
+            lambda _widget, _clock: (
+                AnnotationEditor._flush_pending_redraw(self),
+                GLib.SOURCE_REMOVE,
+            )[1]
+        )
+
+    def _queue_canvas_redraw(self) -> None:
+        if getattr(self, "_canvas_redraw_pending", False):
+            return
+        add_tick_callback = getattr(self._drawing_area, "add_tick_callback", None)
+        if add_tick_callback is None:
+            self._drawing_area.queue_draw()
+            return
+        self._canvas_redraw_pending = True
+        add_tick_callback(
+            lambda _widget, _clock: (
+                AnnotationEditor._flush_canvas_redraw(self),
+                GLib.SOURCE_REMOVE,
+            )[1]
+        )
+
+    def _flush_canvas_redraw(self) -> None:
+        self._canvas_redraw_pending = False
+        self._drawing_area.queue_draw()
+
+    def _flush_pending_redraw(self) -> None:
+        bbox = getattr(self, "_pending_redraw_bbox", None)
+        self._pending_redraw_bbox = None
+        if bbox is None:
+            return
+        area = self._drawing_area
+        queue_draw_area = getattr(area, "queue_draw_area", None)
+        if queue_draw_area is None:
+            area.queue_draw()
+            return
+        x1 = (bbox[0] - _REDRAW_PADDING) * self._scale + self._offset_x
+        y1 = (bbox[1] - _REDRAW_PADDING) * self._scale + self._offset_y
+        x2 = (bbox[2] + _REDRAW_PADDING) * self._scale + self._offset_x
+        y2 = (bbox[3] + _REDRAW_PADDING) * self._scale + self._offset_y
+        queue_draw_area(
+            int(math.floor(x1)),
+            int(math.floor(y1)),
+            int(math.ceil(x2 - x1)),
+            int(math.ceil(y2 - y1)),
+        )
+
+    def _annotation_overlay(self, exclude_index: int | None):
+        """Return the annotations pre-rendered at image resolution.
+
+        Rebuilt only when an edit completes (or the excluded index
+        changes), so steady-state frames composite one surface instead of
+        re-stroking every annotation through Python. During a move drag
+        the dragged annotation is left out and rendered live on top.
+        """
+        overlay = getattr(self, "_overlay_surface", None)
+        if (
+            overlay is None
+            or getattr(self, "_overlay_dirty", True)
+            or getattr(self, "_overlay_exclude", None) != exclude_index
+        ):
+            overlay = cairo.ImageSurface(
+                cairo.FORMAT_ARGB32, self._surface.get_width(), self._surface.get_height()
+            )
+            octx = cairo.Context(overlay)
+            annotations = self._annotations
+            if exclude_index is not None:
+                annotations = [
+                    ann for index, ann in enumerate(annotations) if index != exclude_index
+                ]
+            _render_annotations(octx, annotations)
+            self._overlay_surface = overlay
+            self._overlay_dirty = False
+            self._overlay_exclude = exclude_index
+        return overlay
+
+    def _base_surface_pattern(self):
+        pattern = getattr(self, "_surface_pattern", None)
+        if pattern is None:
+            pattern_cls = getattr(cairo, "SurfacePattern", None)
+            if pattern_cls is None:
+                return None
+            pattern = pattern_cls(self._surface)
+            if hasattr(pattern, "set_filter"):
+                pattern.set_filter(cairo.FILTER_FAST)
+            self._surface_pattern = pattern
+        return pattern
+
     def _on_draw(self, _area, cr, width, height) -> None:
         self._update_viewport(width, height)
 
@@ -656,25 +1341,67 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
         cr.save()
         cr.translate(self._offset_x, self._offset_y)
         cr.scale(self._scale, self._scale)
-        cr.set_source_surface(self._surface, 0, 0)
+
+        img_w = self._surface.get_width()
+        img_h = self._surface.get_height()
+        cr.save()
+        cr.rectangle(0, 0, img_w, img_h)
+        cr.clip()
+        cr.set_operator(cairo.OPERATOR_SOURCE)
+        # The base screenshot never changes, so one persistent pattern
+        # (with its fast filter pre-set) is shared across every frame
+        # instead of rebuilding source state per expose. The interactive
+        # canvas favors speed over resample quality; saved output is
+        # composed unscaled so it is unaffected.
+        pattern = AnnotationEditor._base_surface_pattern(self)
+        if pattern is not None:
+            cr.set_source(pattern)
+        else:
+            cr.set_source_surface(self._surface, 0, 0)
+            source = cr.get_source()
+            if hasattr(source, "set_filter"):
+                source.set_filter(cairo.FILTER_FAST)
+        cr.set_antialias(cairo.ANTIALIAS_FAST)
         cr.paint()
+        cr.restore()
 
-        for ann in self._annotations:
-            _render_annotation(cr, ann)
+        # GTK pre-clips the context to the damage region; the overlay blit
+        # and selection indicator are confined to it. Without usable clip
+        # extents, cull against the visible viewport instead.
+        clip = cr.clip_extents()
+        if not (isinstance(clip, tuple) and len(clip) == 4):
+            if self._scale:
+                left, top = self._widget_to_image(0, 0)
+                right, bottom = self._widget_to_image(width, height)
+                clip = (left, top, right, bottom)
+            else:
+                clip = None
+
+        if self._annotations:
+            exclude = self._selected_index if self._move_dragging else None
+            overlay = AnnotationEditor._annotation_overlay(self, exclude)
+            cr.set_source_surface(overlay, 0, 0)
+            cr.paint()
+            if exclude is not None and 0 <= exclude < len(self._annotations):
+                _render_annotation(cr, self._annotations[exclude])
 
         if self._dragging and self._drag_start and self._drag_end:
-            _render_annotation(
+            _render_shape(
                 cr,
-                _make_shape_annotation(
-                    self._current_tool,
-                    self._drag_start,
-                    self._drag_end,
-                    self._current_color,
-                ),
+                self._current_tool,
+                self._drag_start[0],
+                self._drag_start[1],
+                self._drag_end[0],
+                self._drag_end[1],
+                self._current_color,
             )
 
         if self._selected_index is not None and 0 <= self._selected_index < len(self._annotations):
-            _render_selection_indicator(cr, self._annotations[self._selected_index])
+            selected = self._annotations[self._selected_index]
+            if clip is None or _bbox_intersects(_annotation_bbox(selected), clip):
+                self._selection_cache = _render_selection_indicator(
+                    cr, selected, getattr(self, "_selection_cache", None)
+                )
 
         cr.restore()
 
@@ -699,6 +1426,7 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
             self._drag_start = (ix, iy)
             self._drag_end = (ix, iy)
             self._dragging = True
+            self._last_drag_bbox = None
 
     def _on_drag_update(self, _gesture, offset_x: float, offset_y: float) -> None:
         if self._move_dragging and self._widget_drag_start and self._move_orig_ann:
@@ -707,13 +1435,15 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
             ix, iy = self._widget_to_image(wx, wy)
             sx, sy = self._move_drag_start_img
             dx, dy = ix - sx, iy - sy
-            ann = self._annotations[self._selected_index]
             orig = self._move_orig_ann
-            ann["x1"] = orig["x1"] + dx
-            ann["y1"] = orig["y1"] + dy
-            ann["x2"] = orig["x2"] + dx
-            ann["y2"] = orig["y2"] + dy
-            self._drawing_area.queue_draw()
+            moved = dict(orig)
+            moved["x1"] = orig["x1"] + dx
+            moved["y1"] = orig["y1"] + dy
+            moved["x2"] = orig["x2"] + dx
+            moved["y2"] = orig["y2"] + dy
+            self._annotations[self._selected_index] = moved
+            AnnotationEditor._mark_output_dirty(self)
+            AnnotationEditor._queue_annotation_redraw(self, _annotation_bbox(moved))
             return
 
         if self._pan_dragging and self._pan_start_values:
@@ -724,20 +1454,25 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
             wx = self._widget_drag_start[0] + offset_x
             wy = self._widget_drag_start[1] + offset_y
             self._drag_end = self._widget_to_image(wx, wy)
-            self._drawing_area.queue_draw()
+            sx, sy = self._drag_start
+            ex, ey = self._drag_end
+            AnnotationEditor._queue_annotation_redraw(
+                self, (min(sx, ex), min(sy, ey), max(sx, ex), max(sy, ey))
+            )
 
     def _on_drag_end(self, _gesture, offset_x: float, offset_y: float) -> None:
         if self._move_dragging:
             self._move_dragging = False
-            if self._pre_move_snapshot is not None and self._move_orig_ann is not None:
+            if self._move_orig_ann is not None:
                 if self._selected_index is not None and 0 <= self._selected_index < len(self._annotations):
                     ann = self._annotations[self._selected_index]
                     orig = self._move_orig_ann
                     if self._annotation_moved(ann, orig):
-                        self._undo_stack.append(self._pre_move_snapshot)
-                        self._redo_stack.clear()
-            self._pre_move_snapshot = None
+                        AnnotationEditor._record_change(
+                            self, _ReplaceChange(self._selected_index, orig, ann)
+                        )
             self._move_orig_ann = None
+            self._last_drag_bbox = None
             self._drawing_area.queue_draw()
             return
 
@@ -752,15 +1487,15 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
             wy = self._widget_drag_start[1] + offset_y
             self._drag_end = self._widget_to_image(wx, wy)
             self._dragging = False
-            self._push_undo()
-            self._annotations.append(
-                _make_shape_annotation(
-                    self._current_tool,
-                    self._drag_start,
-                    self._drag_end,
-                    self._current_color,
-                )
+            self._last_drag_bbox = None
+            ann = _make_shape_annotation(
+                self._current_tool,
+                self._drag_start,
+                self._drag_end,
+                self._current_color,
             )
+            self._annotations.append(ann)
+            AnnotationEditor._record_change(self, _AddChange(len(self._annotations) - 1, ann))
             self._set_select_tool()
             self._drawing_area.queue_draw()
 
@@ -815,11 +1550,20 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
         def on_activate(_entry):
             text = entry.get_text().strip()
             if text:
-                self._push_undo()
                 if annotation_index is not None:
-                    self._annotations[annotation_index]["text"] = text
+                    original = self._annotations[annotation_index]
+                    edited = dict(original)
+                    edited["text"] = text
+                    self._annotations[annotation_index] = edited
+                    AnnotationEditor._record_change(
+                        self, _ReplaceChange(annotation_index, original, edited)
+                    )
                 else:
-                    self._annotations.append(_make_text_annotation(text, (ix, iy), self._current_color))
+                    added = _make_text_annotation(text, (ix, iy), self._current_color)
+                    self._annotations.append(added)
+                    AnnotationEditor._record_change(
+                        self, _AddChange(len(self._annotations) - 1, added)
+                    )
                     self._set_select_tool()
                 self._drawing_area.queue_draw()
             popover.popdown()
@@ -838,8 +1582,10 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
 
         if keyval in (Gdk.KEY_Delete, Gdk.KEY_BackSpace):
             if self._selected_index is not None and self._selected_index < len(self._annotations):
-                self._push_undo()
-                self._annotations.pop(self._selected_index)
+                removed = self._annotations.pop(self._selected_index)
+                AnnotationEditor._record_change(
+                    self, _DeleteChange(self._selected_index, removed)
+                )
                 self._selected_index = None
                 self._drawing_area.queue_draw()
                 return True
@@ -864,6 +1610,9 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
         return False
 
     def _on_scroll(self, ctrl, dx: float, dy: float) -> bool:
+        if dy == 0:
+            return True
+
         state = ctrl.get_current_event_state()
 
         if state & Gdk.ModifierType.CONTROL_MASK:
@@ -873,11 +1622,9 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
 
         if state & Gdk.ModifierType.SHIFT_MASK:
             self._pan_x += dy * 30 / self._scale if self._scale else 0
-            self._drawing_area.queue_draw()
-            return True
-
-        self._pan_y += dy * 30 / self._scale if self._scale else 0
-        self._drawing_area.queue_draw()
+        else:
+            self._pan_y += dy * 30 / self._scale if self._scale else 0
+        AnnotationEditor._queue_canvas_redraw(self)
         return True
 
     def _clamp_zoom(self, zoom: float) -> float:
@@ -917,7 +1664,8 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
             self._pan_x = 0.0
             self._pan_y = 0.0
         AnnotationEditor._sync_zoom_controls(self)
-        self._drawing_area.queue_draw()
+        # Ctrl-scroll zooms arrive in bursts; coalesce to one paint per frame.
+        AnnotationEditor._queue_canvas_redraw(self)
 
     def _on_zoom_best_fit_toggled(self, button: Gtk.CheckButton) -> None:
         if getattr(self, "_syncing_zoom_controls", False) or not button.get_active():
@@ -943,9 +1691,60 @@ class AnnotationEditor(Gtk.Box):  # type: ignore[misc]
 
     def _do_save(self) -> None:
         try:
-            output = self._render_output_surface()
             dest = self._build_output_path(self._source_uri)
-            _write_surface_png_securely(output, dest)
-            self._on_save(dest)
+            cached = getattr(self, "_png_cache", None)
+            if cached is not None:
+                _write_png_bytes_securely(cached, dest)
+                self._on_save(dest)
+                return
+            # Composing must stay on the thread that owns the base surface,
+            # but PNG encoding and the file write only touch the detached
+            # result, so they move to a worker and the UI keeps painting
+            # while a multi-megapixel frame is compressed.
+            output = self._render_output_surface()
         except Exception as err:
             self._on_error(f"could not save image ({err})")
+            return
+        idle_add = getattr(GLib, "idle_add", None)
+        if idle_add is None:
+            # No main loop to hop back to: finish inline.
+            AnnotationEditor._save_worker(self, output, dest, None)
+            return
+        self._loaned_output = output
+        threading.Thread(
+            target=AnnotationEditor._save_worker,
+            args=(self, output, dest, idle_add),
+            daemon=True,
+        ).start()
+
+    def _save_worker(self, output, dest, idle_add) -> None:
+        try:
+            # Unlike the clipboard path, files on disk keep libpng's default
+            # compression; off the main loop the extra encode time is free.
+            data = _encode_png_presized(output)
+            _write_png_bytes_securely(data, dest)
+        except Exception as err:
+            message = f"could not save image ({err})"
+            if idle_add is None:
+                AnnotationEditor._fail_save(self, output, message)
+            else:
+                idle_add(AnnotationEditor._fail_save, self, output, message)
+            return
+        if idle_add is None:
+            AnnotationEditor._finish_save(self, output, dest, data)
+        else:
+            idle_add(AnnotationEditor._finish_save, self, output, dest, data)
+
+    def _fail_save(self, output, message: str) -> bool:
+        if getattr(self, "_loaned_output", None) is output:
+            self._loaned_output = None
+        self._on_error(message)
+        return False
+
+    def _finish_save(self, output, dest, data: bytes) -> bool:
+        if getattr(self, "_loaned_output", None) is output:
+            self._loaned_output = None
+        if getattr(self, "_output_cache", None) is output and getattr(self, "_png_cache", None) is None:
+            self._png_cache = memoryview(data)
+        self._on_save(dest)
+        return False
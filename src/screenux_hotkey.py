@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import re
@@ -7,6 +8,8 @@ import shlex
 import shutil
 import subprocess  # nosec B404 - required for trusted local command invocation.
 import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from types import SimpleNamespace
 from typing import Callable
@@ -44,6 +47,12 @@ _GSETTINGS_MODIFIER = {
     "Super": "<Super>",
 }
 
+# Compiled once so hot parsing paths skip the re-module cache lookup.
+_QUOTED_RE = re.compile(r"'([^']+)'")
+_MOD_TOKEN_RE = re.compile(r"<([^>]+)>")
+_STRIP_MODS_RE = re.compile(r"(?:<[^>]+>)+")
+_KEY_SEPARATORS_RE = re.compile(r"[\s_-]+")
+
 _NATIVE_SHORTCUT_KEYS = (
     (GNOME_SHELL_SCHEMA, "show-screenshot"),
     (GNOME_SHELL_SCHEMA, "show-screenshot-ui"),
@@ -138,17 +147,19 @@ def _is_screenux_capture_command(command: str) -> bool:
     return any(os.path.basename(part) == "screenux-screenshot" for part in parts[:-1])
 
 
-def _normalize_key_token(token: str) -> str:
-    text = token.strip()
+def _normalize_key_token(text: str, upper: str | None = None) -> str:
+    # Callers pass pre-stripped tokens (and optionally the uppercase form
+    # they already computed) so this stays a single pass over the string.
     if not text:
         raise ValueError("shortcut key cannot be empty")
     if len(text) == 1:
         return text.upper()
 
-    upper = text.upper()
+    if upper is None:
+        upper = text.upper()
     if upper == "PRINT":
         return "Print"
-    compact = re.sub(r"[\s_-]+", "", upper)
+    compact = _KEY_SEPARATORS_RE.sub("", upper)
     if compact in {"PRINTSCREEN", "PRTSC", "PRTSCN", "SYSREQ"}:
         return "Print"
     if upper.startswith("F") and upper[1:].isdigit():
@@ -165,39 +176,40 @@ def _normalize_key_token(token: str) -> str:
 
     if text.isalpha():
         return text.title()
-    raise ValueError(f"unsupported shortcut key: {token}")
-
-
-def _normalize_modifier_token(token: str) -> str:
-    normalized = _MODIFIER_ALIASES.get(token.strip().strip("<>").upper())
-    if normalized is None:
-        raise ValueError(f"unsupported shortcut modifier: {token}")
-    return normalized
+    raise ValueError(f"unsupported shortcut key: {text}")
 
 
+# The same handful of strings (config value, fallback constants, parsed
+# gsettings bindings) flow through these pure functions over and over per
+# registration; a small bounded cache turns repeats into dict hits.
+# Invalid inputs raise and are deliberately not cached.
+@functools.lru_cache(maxsize=256)
 def normalize_shortcut(value: str) -> str:
-    text = value.strip()
-    if not text:
-        raise ValueError("shortcut cannot be empty")
-
-    parts = [part.strip() for part in text.split("+") if part.strip()]
-    if not parts:
-        raise ValueError("shortcut cannot be empty")
-
+    # Single pass: each token is stripped and upper-cased exactly once, and
+    # that uppercase form feeds both the modifier lookup and the key
+    # normalization.
     modifiers: list[str] = []
     key: str | None = None
-    for part in parts:
-        try:
-            modifier = _normalize_modifier_token(part)
-        except ValueError:
-            if key is not None:
-                raise ValueError("shortcut must contain exactly one non-modifier key")
-            key = _normalize_key_token(part)
+    for part in value.split("+"):
+        token = part.strip()
+        if not token:
             continue
-        if modifier not in modifiers:
-            modifiers.append(modifier)
+        upper = token.upper()
+        modifier = _MODIFIER_ALIASES.get(upper)
+        if modifier is None and "<" in upper:
+            # Accept gsettings-style <Ctrl> tokens like the old tokenizer did.
+            modifier = _MODIFIER_ALIASES.get(upper.strip("<>"))
+        if modifier is not None:
+            if modifier not in modifiers:
+                modifiers.append(modifier)
+            continue
+        if key is not None:
+            raise ValueError("shortcut must contain exactly one non-modifier key")
+        key = _normalize_key_token(token, upper)
 
     if key is None:
+        if not modifiers:
+            raise ValueError("shortcut cannot be empty")
         raise ValueError("shortcut must include a key")
 
     ordered_modifiers = [item for item in _MODIFIER_ORDER if item in modifiers]
@@ -228,8 +240,12 @@ def resolve_shortcut_with_fallback(
 ) -> tuple[str | None, str | None]:
     if preferred is None:
         return None, None
+    return _resolve_normalized_with_fallback(normalize_shortcut(preferred), is_taken)
+
 
-    normalized_preferred = normalize_shortcut(preferred)
+def _resolve_normalized_with_fallback(
+    normalized_preferred: str, is_taken: Callable[[str], bool]
+) -> tuple[str | None, str | None]:
     candidates: list[str] = [normalized_preferred]
     for fallback in FALLBACK_SHORTCUTS:
         if fallback not in candidates:
@@ -244,8 +260,9 @@ def resolve_shortcut_with_fallback(
     return None, "No available global shortcut candidate; hotkey disabled."
 
 
+@functools.lru_cache(maxsize=256)
 def parse_gsettings_binding(raw_value: str) -> str | None:
-    matches = re.findall(r"'([^']+)'", raw_value or "")
+    matches = _QUOTED_RE.findall(raw_value or "")
     if not matches:
         return None
 
@@ -255,14 +272,15 @@ def parse_gsettings_binding(raw_value: str) -> str | None:
 
     modifiers: list[str] = []
     if accel.startswith("<"):
-        for token in re.findall(r"<([^>]+)>", accel):
-            try:
-                modifier = _normalize_modifier_token(token)
-            except ValueError:
+        for token in _MOD_TOKEN_RE.findall(accel):
+            # Tokens captured from <...> carry no brackets or whitespace, so
+            # the alias table can be consulted directly.
+            modifier = _MODIFIER_ALIASES.get(token.upper())
+            if modifier is None:
                 return None
             if modifier not in modifiers:
                 modifiers.append(modifier)
-        key = re.sub(r"(?:<[^>]+>)+", "", accel).strip()
+        key = _STRIP_MODS_RE.sub("", accel).strip()
     else:
         key = accel
 
@@ -277,8 +295,13 @@ def parse_gsettings_binding(raw_value: str) -> str | None:
     return "+".join([*ordered_modifiers, normalized_key])
 
 
+@functools.lru_cache(maxsize=256)
 def shortcut_to_gsettings_binding(shortcut: str) -> str:
     normalized = normalize_shortcut(shortcut)
+    return _PRECOMPUTED_BINDINGS.get(normalized) or _binding_from_normalized(normalized)
+
+
+def _binding_from_normalized(normalized: str) -> str:
     parts = normalized.split("+")
     key = parts[-1]
     modifiers = parts[:-1]
@@ -287,11 +310,75 @@ def shortcut_to_gsettings_binding(shortcut: str) -> str:
     return f"{modifier_prefix}{key_token}"
 
 
-def _schema_exists(schema: str, runner: Runner) -> bool:
+# Bindings for the shortcuts the app actually registers, built once at
+# import; anything else takes the dynamic path on first use.
+_PRECOMPUTED_BINDINGS: dict[str, str] = {
+    _shortcut: _binding_from_normalized(normalize_shortcut(_shortcut))
+    for _shortcut in (DEFAULT_SHORTCUT, *FALLBACK_SHORTCUTS)
+}
+
+
+# gsettings availability and the installed schema list are immutable for
+# the life of the process; cache them per runner so repeated registration
+# passes do not re-spawn the probe subprocesses. Keyed weakly so test
+# runners do not accumulate.
+_RUNNER_PROBE_CACHE: "weakref.WeakKeyDictionary[object, dict[str, object]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _runner_probe_cache(runner: Runner) -> dict[str, object] | None:
+    try:
+        return _RUNNER_PROBE_CACHE.setdefault(runner, {})
+    except TypeError:  # runner is not weak-referenceable; skip caching
+        return None
+
+
+def _list_schemas(runner: Runner) -> frozenset[str] | None:
+    cache = _runner_probe_cache(runner)
+    if cache is not None and "schemas" in cache:
+        return cache["schemas"]  # type: ignore[return-value]
     result = _run(["gsettings", "list-schemas"], runner)
+    schemas = frozenset(_stdout(result).splitlines()) if _success(result) else None
+    if cache is not None:
+        cache["schemas"] = schemas
+    return schemas
+
+
+def _schema_exists(schema: str, runner: Runner) -> bool:
+    schemas = _list_schemas(runner)
+    return schemas is not None and schema in schemas
+
+
+def _parse_recursive_listing(schema: str, result: object) -> dict[str, str] | None:
     if not _success(result):
-        return False
-    return schema in _stdout(result).splitlines()
+        return None
+    schema_id = schema.split(":", 1)[0]
+    values: dict[str, str] = {}
+    for line in _stdout(result).splitlines():
+        parts = line.split(" ", 2)
+        if len(parts) == 3 and parts[0] == schema_id:
+            values[parts[1]] = parts[2].strip()
+    return values or None
+
+
+def _gsettings_list_recursively(schema: str, runner: Runner) -> dict[str, str] | None:
+    """Read every key of *schema* with a single subprocess call.
+
+    Returns a key->raw-value mapping, or None when the batched read is
+    unavailable (command failed or produced nothing) so callers can fall
+    back to per-key ``gsettings get`` invocations.
+    """
+    return _parse_recursive_listing(schema, _run(["gsettings", "list-recursively", schema], runner))
+
+
+def _run_many(commands: list[list[str]], runner: Runner) -> list[object]:
+    # The GIL is released while subprocess.run waits, so independent
+    # gsettings reads can overlap; skip the pool for the trivial cases.
+    if len(commands) <= 1:
+        return [_run(command, runner) for command in commands]
+    with ThreadPoolExecutor(max_workers=min(8, len(commands))) as pool:
+        return list(pool.map(lambda command: _run(command, runner), commands))
 
 
 def _gsettings_get(schema: str, key: str, runner: Runner) -> str | None:
@@ -312,8 +399,13 @@ def _gsettings_reset(schema: str, key: str, runner: Runner) -> bool:
 
 
 def _gsettings_available(runner: Runner) -> bool:
-    result = _run(["gsettings", "--version"], runner)
-    return _success(result)
+    cache = _runner_probe_cache(runner)
+    if cache is not None and "available" in cache:
+        return bool(cache["available"])
+    available = _success(_run(["gsettings", "--version"], runner))
+    if cache is not None:
+        cache["available"] = available
+    return available
 
 
 def _build_gsettings_list(paths: list[str]) -> str:
@@ -331,14 +423,20 @@ def _custom_paths(runner: Runner) -> list[str]:
     raw = _gsettings_get(GNOME_MEDIA_SCHEMA, GNOME_CUSTOM_KEY, runner)
     if raw is None:
         return []
-    return re.findall(r"/org/gnome/settings-daemon/plugins/media-keys/custom-keybindings/custom\d+/", raw)
+    # The value is a GVariant list like ['/…/custom0/', '/…/custom1/'];
+    # slicing out the quoted substrings is cheaper than regex scanning.
+    return [
+        path
+        for path in raw.split("'")[1::2]
+        if path.startswith(f"{GNOME_CUSTOM_BASE_PATH}/custom") and path.endswith("/")
+    ]
 
 
 def _strip_single_quotes(value: str | None) -> str:
-    if value is None:
-        return ""
-    text = value.strip()
-    if text.startswith("'") and text.endswith("'"):
+    text = (value or "").strip()
+    # Only strip when both quotes are present, matching gsettings output;
+    # a lone leading or trailing quote is left untouched.
+    if len(text) >= 2 and text[0] == "'" and text[-1] == "'":
         return text[1:-1]
     return text
 
@@ -346,8 +444,13 @@ def _strip_single_quotes(value: str | None) -> str:
 def _find_screenux_custom_path(paths: list[str], runner: Runner) -> str | None:
     for path in paths:
         schema = f"{GNOME_CUSTOM_SCHEMA}:{path}"
-        current_name = _strip_single_quotes(_gsettings_get(schema, "name", runner))
-        current_command = _strip_single_quotes(_gsettings_get(schema, "command", runner))
+        values = _gsettings_list_recursively(schema, runner)
+        if values is not None:
+            current_name = _strip_single_quotes(values.get("name"))
+            current_command = _strip_single_quotes(values.get("command"))
+        else:
+            current_name = _strip_single_quotes(_gsettings_get(schema, "name", runner))
+            current_command = _strip_single_quotes(_gsettings_get(schema, "command", runner))
         if current_name == SCREENUX_SHORTCUT_NAME or _is_screenux_capture_command(current_command):
             return path
     return None
@@ -363,18 +466,34 @@ def collect_gnome_taken_shortcuts(runner: Runner = _default_runner, exclude_path
 
     taken: set[str] = set()
 
-    for path in _custom_paths(runner):
-        if path == exclude_path:
-            continue
+    # One batched read per custom path and per native schema, issued
+    # concurrently; the per-key gets remain as the fallback when a batched
+    # read yields nothing.
+    custom_paths = [path for path in _custom_paths(runner) if path != exclude_path]
+    schemas = [f"{GNOME_CUSTOM_SCHEMA}:{path}" for path in custom_paths]
+    for schema, _key in _NATIVE_SHORTCUT_KEYS:
+        if schema not in schemas and _schema_exists(schema, runner):
+            schemas.append(schema)
+    results = _run_many([["gsettings", "list-recursively", schema] for schema in schemas], runner)
+    listings = {
+        schema: _parse_recursive_listing(schema, result)
+        for schema, result in zip(schemas, results)
+    }
+
+    for path in custom_paths:
         schema = f"{GNOME_CUSTOM_SCHEMA}:{path}"
-        current_binding = parse_gsettings_binding(_gsettings_get(schema, "binding", runner) or "")
+        values = listings.get(schema)
+        raw = values.get("binding") if values is not None else _gsettings_get(schema, "binding", runner)
+        current_binding = parse_gsettings_binding(raw or "")
         if current_binding:
             taken.add(current_binding)
 
     for schema, key in _NATIVE_SHORTCUT_KEYS:
-        if not _schema_exists(schema, runner):
+        if schema not in listings:
             continue
-        parsed = parse_gsettings_binding(_gsettings_get(schema, key, runner) or "")
+        values = listings[schema]
+        raw = values.get(key) if values is not None else _gsettings_get(schema, key, runner)
+        parsed = parse_gsettings_binding(raw or "")
         if parsed:
             taken.add(parsed)
 
@@ -435,10 +554,22 @@ def _restore_native_print_bindings(runner: Runner) -> list[str]:
 
 
 def _next_available_custom_path(paths: list[str]) -> str:
-    index = 0
+    prefix = f"{GNOME_CUSTOM_BASE_PATH}/custom"
+    used: list[int] = []
+    for path in paths:
+        tail = path[len(prefix):-1] if path.startswith(prefix) and path.endswith("/") else ""
+        if not tail.isdigit():
+            break
+        used.append(int(tail))
+    else:
+        return f"{prefix}{max(used, default=-1) + 1}/"
+
+    # Fallback probing loop for entries that do not follow the customN/
+    # pattern.
     existing = set(paths)
+    index = 0
     while True:
-        candidate = f"{GNOME_CUSTOM_BASE_PATH}/custom{index}/"
+        candidate = f"{prefix}{index}/"
         if candidate not in existing:
             return candidate
         index += 1
@@ -467,8 +598,19 @@ def register_gnome_shortcut(
         return HotkeyRegistrationResult(None, None)
 
     preferred = normalize_shortcut(shortcut)
+    if screenux_path is not None:
+        # Our entry already exists; if it carries the preferred binding the
+        # registration is a no-op and the full taken-shortcut enumeration
+        # (one subprocess per schema and custom path) can be skipped.
+        schema = f"{GNOME_CUSTOM_SCHEMA}:{screenux_path}"
+        values = _gsettings_list_recursively(schema, runner)
+        raw = values.get("binding") if values is not None else _gsettings_get(schema, "binding", runner)
+        if parse_gsettings_binding(raw or "") == preferred:
+            _log_telemetry("register.unchanged", path=screenux_path, resolved=preferred)
+            return HotkeyRegistrationResult(preferred, None)
     taken = collect_gnome_taken_shortcuts(runner=runner, exclude_path=screenux_path)
-    resolved, warning = resolve_shortcut_with_fallback(preferred, lambda candidate: candidate in taken)
+    # preferred is already normalized; skip the re-normalizing public entry.
+    resolved, warning = _resolve_normalized_with_fallback(preferred, lambda candidate: candidate in taken)
     if resolved != preferred:
         conflicts = _native_shortcut_conflicts(preferred, runner)
         if conflicts:
@@ -505,10 +647,20 @@ def register_gnome_shortcut(
 
     target_schema = f"{GNOME_CUSTOM_SCHEMA}:{target_path}"
     capture_command = _resolve_capture_command()
-    name_set = _gsettings_set(target_schema, "name", SCREENUX_SHORTCUT_NAME, runner)
-    command_set = _gsettings_set(target_schema, "command", capture_command, runner)
-    binding_value = shortcut_to_gsettings_binding(resolved)
-    binding_set = _gsettings_set(target_schema, "binding", binding_value, runner)
+    binding_value = _PRECOMPUTED_BINDINGS.get(resolved) or _binding_from_normalized(resolved)
+
+    # For a pre-existing entry, skip the sets whose values already match;
+    # a write that would be a no-op still costs a subprocess.
+    current = _gsettings_list_recursively(target_schema, runner) if screenux_path else None
+
+    def _set_if_changed(key: str, value: str) -> bool:
+        if current is not None and _strip_single_quotes(current.get(key)) == value:
+            return True
+        return _gsettings_set(target_schema, key, value, runner)
+
+    name_set = _set_if_changed("name", SCREENUX_SHORTCUT_NAME)
+    command_set = _set_if_changed("command", capture_command)
+    binding_set = _set_if_changed("binding", binding_value)
     _log_telemetry(
         "register.persisted",
         binding=binding_value,
@@ -562,7 +714,11 @@ class HotkeyManager:
 
     def ensure_registered(self) -> HotkeyRegistrationResult:
         config = self._load_config()
-        has_explicit_hotkey = HOTKEY_CONFIG_KEY in config
+        return self._ensure_registered_with_config(config, HOTKEY_CONFIG_KEY in config)
+
+    def _ensure_registered_with_config(
+        self, config: dict, has_explicit_hotkey: bool
+    ) -> HotkeyRegistrationResult:
         preferred = read_hotkey_from_config(config)
         if _is_gnome_desktop(self._env):
             result = register_gnome_shortcut(preferred, runner=self._runner)
@@ -581,7 +737,8 @@ class HotkeyManager:
         config = self._load_config()
         write_hotkey_to_config(config, value)
         self._save_config(config)
-        return self.ensure_registered()
+        # Reuse the config we just wrote instead of loading it back from disk.
+        return self._ensure_registered_with_config(config, True)
 
     def disable_shortcut(self) -> HotkeyRegistrationResult:
         return self.apply_shortcut(None)
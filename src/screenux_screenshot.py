@@ -5,10 +5,10 @@ import json
 import logging
 import os
 import socket
+import stat
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
-from urllib.parse import unquote, urlparse
 
 try:
     from screenux_hotkey import HotkeyManager
@@ -69,46 +69,75 @@ def enforce_offline_mode() -> None:
 
     original_socket = socket.socket
 
-    class OfflineSocket(original_socket):
-        def connect(self, *_args, **_kwargs):
+    def _guarded_socket(family=socket.AF_INET, *args, **kwargs):
+        # Reject internet sockets at construction instead of subclassing
+        # socket.socket: local AF_UNIX traffic (the session bus the portal
+        # rides on) keeps the unwrapped C implementation with no
+        # per-operation Python dispatch.
+        if family in (socket.AF_INET, socket.AF_INET6):
             raise blocked
+        return original_socket(family, *args, **kwargs)
 
-        def connect_ex(self, *_args, **_kwargs):
-            raise blocked
-
-        def sendto(self, *_args, **_kwargs):
-            raise blocked
-
-    socket.socket = OfflineSocket  # type: ignore[assignment]
+    socket.socket = _guarded_socket  # type: ignore[assignment]
 
 
 def _config_path() -> Path:
+    # Deliberately not memoized: the result tracks whether the GLib import
+    # succeeded, and callers that matter (load_config) already cache their
+    # own derived state, so the win would be one Path join per save.
     if GLib is not None:
         return Path(GLib.get_user_config_dir()) / "screenux" / "settings.json"
     return Path.home() / ".config" / "screenux" / "settings.json"
 
 
+# Parsed settings keyed by (path, mtime_ns, size). Saves re-reading and
+# re-parsing the file on every resolve_save_dir/build_output_path call;
+# external edits are still picked up because the stat key changes.
+_config_cache: tuple[Path, int, int, dict] | None = None
+
+
 def load_config() -> dict:
+    global _config_cache
     path = _config_path()
-    if path.is_file():
-        try:
-            stat = path.stat()
-            if stat.st_size > _MAX_CONFIG_SIZE:
-                return {}
-            config = json.loads(path.read_text(encoding="utf-8"))
-            return config if isinstance(config, dict) else {}
-        except (json.JSONDecodeError, OSError):
-            pass
-    return {}
+    try:
+        # One stat answers existence, regular-file, size, and the cache key.
+        st = os.stat(path)
+    except OSError:
+        return {}
+    if not stat.S_ISREG(st.st_mode) or st.st_size > _MAX_CONFIG_SIZE:
+        return {}
+    cached = _config_cache
+    if (
+        cached is not None
+        and cached[0] == path
+        and cached[1] == st.st_mtime_ns
+        and cached[2] == st.st_size
+    ):
+        return dict(cached[3])
+    try:
+        # read_bytes lets json handle UTF-8 itself, skipping the separate
+        # str decode pass.
+        config = json.loads(path.read_bytes())
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(config, dict):
+        return {}
+    _config_cache = (path, st.st_mtime_ns, st.st_size, config)
+    # Hand out a copy so callers mutating their view cannot poison the cache.
+    return dict(config)
 
 
-def save_config(config: dict) -> None:
+def save_config(config: dict, *, durable: bool = False) -> None:
+    global _config_cache
     if not isinstance(config, dict):
         raise TypeError("config must be a dictionary")
     path = _config_path()
     path.parent.mkdir(parents=True, mode=0o700, exist_ok=True)
     try:
-        os.chmod(path.parent, 0o700)
+        # chmod only when the mode actually drifted; the common case is a
+        # directory this process created with the right mode already.
+        if (os.stat(path.parent).st_mode & 0o777) != 0o700:
+            os.chmod(path.parent, 0o700)
     except OSError:
         pass
 
@@ -116,26 +145,51 @@ def save_config(config: dict) -> None:
     payload = json.dumps(config, indent=2)
     fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as handle:
-            handle.write(payload)
-            handle.flush()
-            os.fsync(handle.fileno())
+        # Write the encoded payload straight through the fd; wrapping it in a
+        # TextIOWrapper would add a buffer layer and a second encode pass for
+        # a blob we already have in hand.
+        buf = memoryview(payload.encode("utf-8"))
+        try:
+            while buf:
+                written = os.write(fd, buf)
+                buf = buf[written:]
+            if durable:
+                # Settings only need "old file or new file" on crash, which
+                # the rename below provides; a full flush to disk is opt-in
+                # because fsync can stall for hundreds of milliseconds on a
+                # busy disk. No in-tree caller needs power-loss durability
+                # today, so nothing passes durable=True; the knob is for
+                # callers that do.
+                os.fsync(fd)
+        finally:
+            os.close(fd)
         os.replace(temp_path, path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            _config_cache = None
+        else:
+            _config_cache = (path, st.st_mtime_ns, st.st_size, dict(config))
     finally:
-        if temp_path.exists():
-            try:
-                temp_path.unlink()
-            except OSError:
-                pass
+        # On the happy path the temp file was renamed away; unlink
+        # unconditionally instead of paying a stat to find that out.
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+# Last resolved target keyed by (configured save_dir, pictures base); a hit
+# only pays one access() check instead of the mkdir/is_dir/access sequence.
+_save_dir_cache: tuple[str | None, Path, Path] | None = None
 
 
 def resolve_save_dir() -> Path:
+    global _save_dir_cache
     config = load_config()
     custom_dir = config.get("save_dir")
-    if isinstance(custom_dir, str) and custom_dir.strip():
-        custom_path = Path(custom_dir).expanduser()
-        if custom_path.is_dir() and os.access(custom_path, os.W_OK | os.X_OK):
-            return custom_path
+    if not (isinstance(custom_dir, str) and custom_dir.strip()):
+        custom_dir = None
 
     pictures_dir: str | None = None
     if GLib is not None:
@@ -143,8 +197,22 @@ def resolve_save_dir() -> Path:
             pictures_dir = GLib.get_user_special_dir(GLib.UserDirectory.DIRECTORY_PICTURES)
         except Exception:
             pictures_dir = None
-
     base_dir = Path(pictures_dir).expanduser() if pictures_dir else (Path.home() / "Pictures")
+
+    cached = _save_dir_cache
+    if cached is not None and cached[0] == custom_dir and cached[1] == base_dir:
+        resolved = cached[2]
+        # Still confirm the directory is usable; it may have been removed
+        # since the last capture.
+        if os.access(resolved, os.W_OK | os.X_OK):
+            return resolved
+
+    if custom_dir is not None:
+        custom_path = Path(custom_dir).expanduser()
+        if custom_path.is_dir() and os.access(custom_path, os.W_OK | os.X_OK):
+            _save_dir_cache = (custom_dir, base_dir, custom_path)
+            return custom_path
+
     screenshots_dir = base_dir / "Screenshots"
     try:
         screenshots_dir.mkdir(parents=True, exist_ok=True)
@@ -152,20 +220,50 @@ def resolve_save_dir() -> Path:
         pass
     else:
         if screenshots_dir.is_dir() and os.access(screenshots_dir, os.W_OK | os.X_OK):
+            _save_dir_cache = (custom_dir, base_dir, screenshots_dir)
             return screenshots_dir
 
     return Path.home()
 
 
 def _extension_from_uri(source_uri: str) -> str:
-    suffix = Path(unquote(urlparse(source_uri).path)).suffix.lower()
+    # Portal URIs are plain file:// paths, so a tail scan replaces the
+    # urlparse/unquote/Path triple on the common case; anything irregular
+    # after the final dot (separator, percent-encoding, query or fragment
+    # markers) falls back to the full parser.
+    i = source_uri.rfind(".")
+    if i < 0:
+        return ".png"
+    suffix = source_uri[i:]
+    if any(ch in suffix for ch in "/%?#"):
+        # Deferred: the parser only loads when an irregular URI shows up,
+        # keeping urllib out of the import chain for --help/--version and
+        # the normal capture flow.
+        from urllib.parse import unquote, urlparse
+
+        suffix = Path(unquote(urlparse(source_uri).path)).suffix
+    suffix = suffix.lower()
     return suffix if suffix in _ALLOWED_EXTENSIONS else ".png"
 
 
-def build_output_path(source_uri: str) -> Path:
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    save_dir = resolve_save_dir().resolve()
-    output_path = (save_dir / f"Screenshot_{timestamp}{_extension_from_uri(source_uri)}").resolve()
+def build_output_path(source_uri: str, save_dir: Path | None = None) -> Path:
+    # Fixed ASCII layout; formatting from time_ns directly avoids the
+    # datetime allocation and locale-aware strftime dispatch per capture.
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    tm = time.localtime(seconds)
+    timestamp = (
+        f"{tm.tm_year:04d}{tm.tm_mon:02d}{tm.tm_mday:02d}"
+        f"_{tm.tm_hour:02d}{tm.tm_min:02d}{tm.tm_sec:02d}_{micros:06d}"
+    )
+    # Callers that already resolved the target directory can pass it in and
+    # skip the config read and directory probes.
+    if save_dir is None:
+        save_dir = resolve_save_dir()
+    save_dir = save_dir.resolve()
+    # The generated name is digits plus an allow-listed extension — no
+    # separators or dot-dot — so appending to the canonical directory needs
+    # no second realpath walk; the parent comparison stays as a guard.
+    output_path = save_dir / f"Screenshot_{timestamp}{_extension_from_uri(source_uri)}"
     if output_path.parent != save_dir:
         raise ValueError("resolved output path escapes save directory")
     return output_path
@@ -223,11 +321,13 @@ if Gtk is not None:
             return False
 
         def do_command_line(self, command_line: Gio.ApplicationCommandLine) -> int:
-            args = [arg.decode("utf-8") if isinstance(arg, bytes) else str(arg) for arg in command_line.get_arguments()]
-            _, auto_capture = _parse_cli_args(args)
+            # Compare against raw arguments directly; decoding every argv entry
+            # just to look for one flag is wasted work on the hotkey hot path.
+            raw_args = command_line.get_arguments()
+            auto_capture = any(arg == b"--capture" or arg == "--capture" for arg in raw_args)
             if auto_capture:
                 self._auto_capture_pending = True
-                LOGGER.info("hotkey.event.detected source=command-line args=%s", args)
+                LOGGER.info("hotkey.event.detected source=command-line args=%s", raw_args)
             self.activate()
             return 0
 
@@ -243,6 +343,7 @@ if Gtk is not None:
             auto_capture = self._auto_capture_pending
             self._auto_capture_pending = False
             window = self.props.active_window
+            had_window = window is not None
             if window is None:
                 window = MainWindow(
                     self,
@@ -269,7 +370,14 @@ if Gtk is not None:
                 window.present()
             if auto_capture:
                 LOGGER.info("hotkey.event.handled source=activation mode=idle-capture")
-                GLib.idle_add(self._trigger_auto_capture, window)
+                if had_window:
+                    # A re-presented window should get a paint cycle before
+                    # the portal dialog grabs focus.
+                    GLib.idle_add(self._trigger_auto_capture, window)
+                else:
+                    # Freshly created window: start the portal flow now
+                    # instead of waiting a main-loop tick.
+                    window.take_screenshot()
 else:
     class ScreenuxScreenshotApp:  # pragma: no cover
         def run(self, _argv: list[str]) -> int:
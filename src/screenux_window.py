@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+import stat
+import threading
 import time
 from pathlib import Path
 from urllib.parse import unquote, urlparse
@@ -12,9 +14,26 @@ gi.require_version("Gdk", "4.0")
 gi.require_version("Gtk", "4.0")
 from gi.repository import Gdk, Gio, GLib, Gtk, Pango
 
-from screenux_editor import AnnotationEditor, load_image_surface
 from screenux_hotkey import DEFAULT_SHORTCUT, normalize_shortcut
 
+# The editor pulls in Cairo and the whole annotation machinery, none of
+# which is needed until a capture lands; importing it lazily keeps the
+# hotkey-driven cold start (and idle RSS) small. Populated on first use
+# by _ensure_editor_imports.
+AnnotationEditor: Any = None
+load_image_surface: Any = None
+
+
+def _ensure_editor_imports() -> None:
+    global AnnotationEditor, load_image_surface
+    if AnnotationEditor is None or load_image_surface is None:
+        import screenux_editor
+
+        if AnnotationEditor is None:
+            AnnotationEditor = screenux_editor.AnnotationEditor
+        if load_image_surface is None:
+            load_image_surface = screenux_editor.load_image_surface
+
 PORTAL_DEST = "org.freedesktop.portal.Desktop"
 PORTAL_PATH = "/org/freedesktop/portal/desktop"
 PORTAL_SCREENSHOT_IFACE = "org.freedesktop.portal.Screenshot"
@@ -23,6 +42,64 @@ _DEFAULT_WINDOW_WIDTH = 520
 _DEFAULT_WINDOW_HEIGHT = 220
 
 
+_portal_call_cache: tuple[Any, ...] | None = None
+
+
+def _portal_call_constants() -> tuple[Any, Any, Any, Any]:
+    """Return the immutable Variant constants for portal Screenshot calls.
+
+    Yields the reply VariantType, the boolean-true Variant, the ``{sv}``
+    entry type, and the empty-string Variant. All are identical for every
+    request, so they are built once per GLib binding rather than on each
+    button press. The latter two are None on bindings without the direct
+    Variant constructors.
+    """
+    global _portal_call_cache
+    cached = _portal_call_cache
+    if cached is not None and cached[0] is GLib:
+        return cached[1], cached[2], cached[3], cached[4]
+    reply_type = GLib.VariantType("(o)")
+    true_variant = GLib.Variant("b", True)
+    new_string = getattr(GLib.Variant, "new_string", None)
+    if new_string is not None:
+        sv_type = GLib.VariantType("{sv}")
+        empty_string = new_string("")
+    else:
+        sv_type = None
+        empty_string = None
+    _portal_call_cache = (GLib, reply_type, true_variant, sv_type, empty_string)
+    return reply_type, true_variant, sv_type, empty_string
+
+
+def _build_portal_params(token: str) -> tuple[Any, Any]:
+    """Build the ``(sa{sv})`` Screenshot parameters for ``token``.
+
+    Returns ``(params, reply_type)``. Uses the direct Variant constructors
+    when the binding has them, skipping the per-call format-string parse;
+    otherwise falls back to the format-string form.
+    """
+    reply_type, true_variant, sv_type, empty_string = _portal_call_constants()
+    if empty_string is not None:
+        variant = GLib.Variant
+        entries = [
+            variant.new_dict_entry(
+                variant.new_string("handle_token"),
+                variant.new_variant(variant.new_string(token)),
+            ),
+            variant.new_dict_entry(
+                variant.new_string("interactive"),
+                variant.new_variant(true_variant),
+            ),
+        ]
+        params = variant.new_tuple(empty_string, variant.new_array(sv_type, entries))
+        return params, reply_type
+    options = {
+        "handle_token": GLib.Variant("s", token),
+        "interactive": true_variant,
+    }
+    return GLib.Variant("(sa{sv})", ("", options)), reply_type
+
+
 def _initial_window_size() -> tuple[int, int]:
     return (_DEFAULT_WINDOW_WIDTH, _DEFAULT_WINDOW_HEIGHT)
 
@@ -46,43 +123,86 @@ def _shortcut_display_text(shortcut: str) -> str:
     return shortcut.replace("+", " + ")
 
 
-def _shortcut_modifiers_from_state(state: int) -> list[str]:
-    modifiers: list[str] = []
+_modifier_mapping_cache: tuple[Any, tuple[tuple[int, str], ...]] | None = None
+
+
+def _modifier_mapping() -> tuple[tuple[int, str], ...]:
+    # Built once per Gdk binding so the key-press handler does not
+    # reallocate the mask table on every event.
+    global _modifier_mapping_cache
+    cached = _modifier_mapping_cache
+    if cached is not None and cached[0] is Gdk:
+        return cached[1]
     mapping = (
         (Gdk.ModifierType.CONTROL_MASK, "Ctrl"),
         (Gdk.ModifierType.ALT_MASK, "Alt"),
         (Gdk.ModifierType.SHIFT_MASK, "Shift"),
         (Gdk.ModifierType.SUPER_MASK, "Super"),
     )
-    for mask, token in mapping:
+    _modifier_mapping_cache = (Gdk, mapping)
+    return mapping
+
+
+def _shortcut_modifiers_from_state(state: int) -> list[str]:
+    modifiers: list[str] = []
+    for mask, token in _modifier_mapping():
         if state & mask:
             modifiers.append(token)
     return modifiers
 
 
-def _is_modifier_keyval(keyval: int) -> bool:
-    modifier_keys = (
-        Gdk.KEY_Control_L,
-        Gdk.KEY_Control_R,
-        Gdk.KEY_Shift_L,
-        Gdk.KEY_Shift_R,
-        Gdk.KEY_Alt_L,
-        Gdk.KEY_Alt_R,
-        Gdk.KEY_Super_L,
-        Gdk.KEY_Super_R,
-        Gdk.KEY_Meta_L,
-        Gdk.KEY_Meta_R,
+_keyval_tables_cache: tuple[Any, frozenset[int], dict[int, str]] | None = None
+
+
+def _keyval_tables() -> tuple[frozenset[int], dict[int, str]]:
+    """Return hashed lookup tables for modifier and special keyvals.
+
+    Built once per Gdk binding (tests swap the binding per test) so the
+    key-press handler does O(1) membership checks instead of scanning
+    tuples on every event.
+    """
+    global _keyval_tables_cache
+    cached = _keyval_tables_cache
+    if cached is not None and cached[0] is Gdk:
+        return cached[1], cached[2]
+    modifiers = frozenset(
+        (
+            Gdk.KEY_Control_L,
+            Gdk.KEY_Control_R,
+            Gdk.KEY_Shift_L,
+            Gdk.KEY_Shift_R,
+            Gdk.KEY_Alt_L,
+            Gdk.KEY_Alt_R,
+            Gdk.KEY_Super_L,
+            Gdk.KEY_Super_R,
+            Gdk.KEY_Meta_L,
+            Gdk.KEY_Meta_R,
+        )
     )
-    return keyval in modifier_keys
+    specials = {
+        Gdk.KEY_Return: "Enter",
+        Gdk.KEY_KP_Enter: "Enter",
+        Gdk.KEY_ISO_Left_Tab: "Tab",
+    }
+    space = getattr(Gdk, "KEY_space", None)
+    if space is not None:
+        specials[space] = "Space"
+    _keyval_tables_cache = (Gdk, modifiers, specials)
+    return modifiers, specials
+
+
+def _is_modifier_keyval(keyval: int) -> bool:
+    modifiers, _ = _keyval_tables()
+    return keyval in modifiers
 
 
 def _shortcut_key_token_from_keyval(keyval: int) -> str | None:
-    if _is_modifier_keyval(keyval):
+    modifiers, specials = _keyval_tables()
+    if keyval in modifiers:
         return None
-    if keyval in (Gdk.KEY_Return, Gdk.KEY_KP_Enter):
-        return "Enter"
-    if keyval == Gdk.KEY_ISO_Left_Tab:
-        return "Tab"
+    token = specials.get(keyval)
+    if token is not None:
+        return token
 
     key_name = Gdk.keyval_name(keyval) or ""
     if not key_name:
@@ -129,14 +249,47 @@ def _uri_to_local_path(source_uri: str) -> Path | None:
     if not path.is_absolute():
         return None
 
+    # One stat answers "exists and is a regular file"; resolve(strict=True)
+    # would stat every component just to chase symlinks we do not need
+    # chased for the portal's own path.
     try:
-        resolved = path.resolve(strict=True)
+        st = os.stat(path)
     except OSError:
         return None
 
-    if not resolved.is_file() or not os.access(resolved, os.R_OK):
+    if not stat.S_ISREG(st.st_mode) or not os.access(path, os.R_OK):
         return None
-    return resolved
+    return path
+
+
+def _copy_capture_securely(source: Path, destination: Path) -> None:
+    # Same contract as the editor's _write_png_bytes_securely:
+    # O_CREAT|O_EXCL|O_NOFOLLOW enforces no-clobber/no-symlink at open
+    # time and the file is created owner-only.
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    if hasattr(os, "O_NOFOLLOW"):
+        flags |= os.O_NOFOLLOW
+
+    data = source.read_bytes()
+    try:
+        fd = os.open(destination, flags, 0o600)
+    except FileNotFoundError:
+        raise RuntimeError("destination directory does not exist") from None
+    try:
+        buf = memoryview(data)
+        try:
+            while buf:
+                written = os.write(fd, buf)
+                buf = buf[written:]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except Exception:
+        try:
+            destination.unlink(missing_ok=True)
+        except OSError:
+            pass
+        raise
 
 
 class MainWindow(Gtk.ApplicationWindow):  # type: ignore[misc]
@@ -166,6 +319,7 @@ class MainWindow(Gtk.ApplicationWindow):  # type: ignore[misc]
 
         self._request_counter = 0
         self._bus = None
+        self._sender_name: str | None = None
         self._signal_sub_id: int | None = None
         self._hotkey_entry: Gtk.Entry | None = None
         self._hotkey_value_label: Gtk.Label | None = None
@@ -175,10 +329,10 @@ class MainWindow(Gtk.ApplicationWindow):  # type: ignore[misc]
         self._closing_preview_programmatically = False
 
         self._main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        self._main_box.set_margin_top(16)
-        self._main_box.set_margin_bottom(16)
-        self._main_box.set_margin_start(16)
-        self._main_box.set_margin_end(16)
+        # One property round-trip instead of four margin-setter FFI calls.
+        self._main_box.set_properties(
+            margin_top=16, margin_bottom=16, margin_start=16, margin_end=16
+        )
 
         self._button = Gtk.Button(label="Take Screenshot")
         self._button.connect("clicked", lambda _button: self.take_screenshot())
@@ -456,16 +610,40 @@ class MainWindow(Gtk.ApplicationWindow):  # type: ignore[misc]
         self._set_status("Capturing...")
 
         try:
-            self._bus = Gio.bus_get_sync(Gio.BusType.SESSION, None)
-            sender_name = self._bus.get_unique_name()
-            if not sender_name:
-                raise RuntimeError("missing DBus unique name")
+            # The connection and its unique name are fixed for the process;
+            # fetch them once and reuse on subsequent captures. The cache is
+            # only populated from a connection that produced a usable name.
+            sender_name = getattr(self, "_sender_name", None)
+            if self._bus is not None:
+                is_closed = getattr(self._bus, "is_closed", None)
+                if is_closed is not None and is_closed():
+                    # The session bus went away (e.g. daemon restart);
+                    # drop the stale connection and re-acquire below.
+                    self._bus = None
+                    self._sender_name = None
+                    sender_name = None
+            if self._bus is None or not sender_name:
+                self._bus = Gio.bus_get_sync(Gio.BusType.SESSION, None)
+                sender_name = self._bus.get_unique_name()
+                if not sender_name:
+                    raise RuntimeError("missing DBus unique name")
+                self._sender_name = sender_name
+                # The normalized prefix only depends on the unique name, so
+                # per capture only the token needs appending.
+                self._request_path_prefix = (
+                    f"/org/freedesktop/portal/desktop/request/"
+                    f"{_normalize_bus_name(sender_name)}/"
+                )
 
             token = self._build_handle_token()
-            request_path = (
-                f"/org/freedesktop/portal/desktop/request/"
-                f"{_normalize_bus_name(sender_name)}/{token}"
-            )
+            prefix = getattr(self, "_request_path_prefix", None)
+            if prefix is None:
+                prefix = (
+                    f"/org/freedesktop/portal/desktop/request/"
+                    f"{_normalize_bus_name(sender_name)}/"
+                )
+                self._request_path_prefix = prefix
+            request_path = prefix + token
 
             self._signal_sub_id = self._bus.signal_subscribe(
                 PORTAL_DEST,
@@ -477,11 +655,27 @@ class MainWindow(Gtk.ApplicationWindow):  # type: ignore[misc]
                 self._on_portal_response,
             )
 
-            options = {
-                "handle_token": GLib.Variant("s", token),
-                "interactive": GLib.Variant("b", True),
-            }
-            params = GLib.Variant("(sa{sv})", ("", options))
+            params, reply_type = _build_portal_params(token)
+
+            call_async = getattr(self._bus, "call", None)
+            if call_async is not None:
+                # Asynchronous round-trip: the portal reply arrives via the
+                # main loop, so GTK keeps repainting (the "Capturing..."
+                # status shows immediately) instead of blocking on DBus.
+                call_async(
+                    PORTAL_DEST,
+                    PORTAL_PATH,
+                    PORTAL_SCREENSHOT_IFACE,
+                    "Screenshot",
+                    params,
+                    reply_type,
+                    Gio.DBusCallFlags.NONE,
+                    -1,
+                    None,
+                    self._on_screenshot_call_done,
+                    request_path,
+                )
+                return
 
             result = self._bus.call_sync(
                 PORTAL_DEST,
@@ -489,41 +683,94 @@ class MainWindow(Gtk.ApplicationWindow):  # type: ignore[misc]
                 PORTAL_SCREENSHOT_IFACE,
                 "Screenshot",
                 params,
-                GLib.VariantType("(o)"),
+                reply_type,
                 Gio.DBusCallFlags.NONE,
                 -1,
                 None,
             )
+            MainWindow._handle_screenshot_reply(self, result.unpack()[0], request_path)
+        except GLib.Error as err:
+            self._fail(f"portal unavailable ({err.message})")
+        except Exception as err:
+            self._fail(str(err))
 
-            returned_request_path = result.unpack()[0]
-            if returned_request_path != request_path:
-                self._unsubscribe_signal()
-                self._signal_sub_id = self._bus.signal_subscribe(
-                    PORTAL_DEST,
-                    PORTAL_REQUEST_IFACE,
-                    "Response",
-                    returned_request_path,
-                    None,
-                    Gio.DBusSignalFlags.NONE,
-                    self._on_portal_response,
-                )
+    def _on_screenshot_call_done(self, connection, result, request_path: str) -> None:
+        try:
+            reply = connection.call_finish(result)
+            MainWindow._handle_screenshot_reply(self, reply.unpack()[0], request_path)
         except GLib.Error as err:
             self._fail(f"portal unavailable ({err.message})")
         except Exception as err:
             self._fail(str(err))
 
+    def _handle_screenshot_reply(self, returned_request_path: str, request_path: str) -> None:
+        # The portal may assign its own request path; move the Response
+        # subscription over when the reply disagrees with our prediction.
+        if returned_request_path != request_path:
+            self._unsubscribe_signal()
+            self._signal_sub_id = self._bus.signal_subscribe(
+                PORTAL_DEST,
+                PORTAL_REQUEST_IFACE,
+                "Response",
+                returned_request_path,
+                None,
+                Gio.DBusSignalFlags.NONE,
+                self._on_portal_response,
+            )
+
     def _save_uri(self, source_uri: str) -> None:
         self._unsubscribe_signal()
         source_path = _uri_to_local_path(source_uri)
         if source_path is None:
             self._fail("invalid screenshot source path")
             return
+        # Users who never annotate can skip the decode + editor entirely:
+        # the portal already wrote a finished PNG, so saving is one file
+        # copy. load_config memoizes, so this check costs no extra I/O.
+        if self._load_config().get("skip_editor"):
+            try:
+                destination = self._build_output_path(source_uri)
+                _copy_capture_securely(source_path, destination)
+            except Exception as err:
+                self._fail(f"could not save ({err})")
+                return
+            self._on_editor_save(destination)
+            return
+        _ensure_editor_imports()
+        # Decoding a multi-megapixel PNG stalls the main loop for long
+        # enough to freeze the window; do it on a worker and hop back to
+        # the main context to build the editor once the surface exists.
+        idle_add = getattr(GLib, "idle_add", None)
+        if idle_add is None:
+            # No main loop to hop back to: finish inline.
+            MainWindow._load_worker(self, source_path, source_uri, None)
+            return
+        threading.Thread(
+            target=MainWindow._load_worker,
+            args=(self, source_path, source_uri, idle_add),
+            daemon=True,
+        ).start()
+
+    def _load_worker(self, source_path: Path, source_uri: str, idle_add) -> None:
         try:
             surface = load_image_surface(str(source_path))
         except Exception as err:
-            self._fail(f"could not load image ({err})")
+            message = f"could not load image ({err})"
+            if idle_add is None:
+                MainWindow._fail_load(self, message)
+            else:
+                idle_add(MainWindow._fail_load, self, message)
             return
+        if idle_add is None:
+            MainWindow._present_editor(self, surface, source_uri)
+        else:
+            idle_add(MainWindow._present_editor, self, surface, source_uri)
 
+    def _fail_load(self, message: str) -> bool:
+        self._fail(message)
+        return False
+
+    def _present_editor(self, surface, source_uri: str) -> bool:
         editor = AnnotationEditor(
             surface,
             source_uri,
@@ -550,6 +797,7 @@ class MainWindow(Gtk.ApplicationWindow):  # type: ignore[misc]
             else:
                 self.present()
             self._present_after_capture = False
+        return False
 
     def _on_editor_save(self, saved_path: Path) -> None:
         self._show_main_panel()
@@ -116,6 +116,22 @@ def test_save_and_load_config(tmp_path, monkeypatch):
     assert loaded == {"save_dir": "/home/user/Screenshots"}
 
 
+def test_save_config_fsyncs_only_when_durable(tmp_path, monkeypatch):
+    config_file = tmp_path / "screenux" / "settings.json"
+    monkeypatch.setattr(app, "_config_path", lambda: config_file)
+
+    fsync_calls = []
+    monkeypatch.setattr(app.os, "fsync", lambda fd: fsync_calls.append(fd))
+
+    app.save_config({"save_dir": "/a"})
+    assert json.loads(config_file.read_text(encoding="utf-8")) == {"save_dir": "/a"}
+    assert fsync_calls == []
+
+    app.save_config({"save_dir": "/b"}, durable=True)
+    assert json.loads(config_file.read_text(encoding="utf-8")) == {"save_dir": "/b"}
+    assert len(fsync_calls) == 1
+
+
 def test_load_config_handles_corrupt_json(tmp_path, monkeypatch):
     config_file = tmp_path / "settings.json"
     config_file.write_text("not valid json{{{", encoding="utf-8")
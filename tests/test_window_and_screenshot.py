@@ -72,6 +72,27 @@ class DummyBus:
         return SimpleNamespace(unpack=lambda: (self.call_return_path,))
 
 
+class AsyncDummyBus(DummyBus):
+    def __init__(self, unique_name=":1.23", closed=False):
+        super().__init__(unique_name)
+        self.closed = closed
+        self.async_calls = []
+        self.call_error = None
+
+    def is_closed(self):
+        return self.closed
+
+    def call(self, *args):
+        *call_args, callback, user_data = args
+        self.async_calls.append(call_args)
+        callback(self, "async-result", user_data)
+
+    def call_finish(self, _result):
+        if self.call_error is not None:
+            raise self.call_error
+        return SimpleNamespace(unpack=lambda: (self.call_return_path,))
+
+
 class DummyVariant:
     def __init__(self, _sig, value):
         self.value = value
@@ -154,6 +175,11 @@ class FakeWindowSelf:
                 parameters,
             )
         )
+        self._on_screenshot_call_done = (
+            lambda connection, result, request_path: window.MainWindow._on_screenshot_call_done(
+                self, connection, result, request_path
+            )
+        )
         self._on_editor_save = lambda saved_path: window.MainWindow._on_editor_save(self, saved_path)
         self._on_editor_discard = lambda: window.MainWindow._on_editor_discard(self)
         self._on_editor_error = lambda message: window.MainWindow._on_editor_error(self, message)
@@ -496,6 +522,102 @@ def test_window_take_screenshot_success_and_resubscribe(monkeypatch):
     assert self._signal_sub_id == 2
 
 
+def _async_portal_fakes(bus):
+    fake_gio = SimpleNamespace(
+        BusType=SimpleNamespace(SESSION=1),
+        DBusSignalFlags=SimpleNamespace(NONE=0),
+        DBusCallFlags=SimpleNamespace(NONE=0),
+        bus_get_sync=lambda *_args: bus,
+    )
+    fake_glib = SimpleNamespace(
+        Variant=DummyVariant,
+        VariantType=lambda s: s,
+        Error=DummyError,
+    )
+    return fake_gio, fake_glib
+
+
+def test_window_take_screenshot_async_reply_matches_request_path(monkeypatch):
+    self = FakeWindowSelf()
+    bus = AsyncDummyBus()
+    self._bus = bus
+
+    request_path = "/org/freedesktop/portal/desktop/request/1_23/tok"
+    bus.call_return_path = request_path
+
+    monkeypatch.setattr(window.MainWindow, "_build_handle_token", lambda _self: "tok")
+    fake_gio, fake_glib = _async_portal_fakes(bus)
+    monkeypatch.setattr(window, "Gio", fake_gio)
+    monkeypatch.setattr(window, "GLib", fake_glib)
+
+    window.MainWindow._on_take_screenshot(self, None)
+
+    assert len(bus.async_calls) == 1
+    assert len(bus.subscriptions) == 1
+    assert bus.subscriptions[0][3] == request_path
+    assert self._signal_sub_id == 1
+    assert bus.unsubscribe_calls == []
+    assert self._status_label.text == "Capturing..."
+
+
+def test_window_take_screenshot_async_reply_resubscribes_on_mismatch(monkeypatch):
+    self = FakeWindowSelf()
+    bus = AsyncDummyBus()
+    self._bus = bus
+
+    request_path = "/org/freedesktop/portal/desktop/request/1_23/tok"
+    bus.call_return_path = request_path + "_different"
+
+    monkeypatch.setattr(window.MainWindow, "_build_handle_token", lambda _self: "tok")
+    fake_gio, fake_glib = _async_portal_fakes(bus)
+    monkeypatch.setattr(window, "Gio", fake_gio)
+    monkeypatch.setattr(window, "GLib", fake_glib)
+
+    window.MainWindow._on_take_screenshot(self, None)
+
+    assert len(bus.async_calls) == 1
+    assert len(bus.subscriptions) == 2
+    assert bus.subscriptions[1][3] == bus.call_return_path
+    assert self._signal_sub_id == 2
+    assert bus.unsubscribe_calls == [1]
+
+
+def test_window_take_screenshot_async_reply_error(monkeypatch):
+    self = FakeWindowSelf()
+    bus = AsyncDummyBus()
+    bus.call_error = DummyError("portal down")
+    self._bus = bus
+
+    monkeypatch.setattr(window.MainWindow, "_build_handle_token", lambda _self: "tok")
+    fake_gio, fake_glib = _async_portal_fakes(bus)
+    monkeypatch.setattr(window, "Gio", fake_gio)
+    monkeypatch.setattr(window, "GLib", fake_glib)
+
+    window.MainWindow._on_take_screenshot(self, None)
+
+    assert self._status_label.text == "Failed: portal unavailable (portal down)"
+
+
+def test_window_take_screenshot_reacquires_closed_bus(monkeypatch):
+    self = FakeWindowSelf()
+    stale = AsyncDummyBus(closed=True)
+    fresh = AsyncDummyBus()
+    self._bus = stale
+    self._sender_name = ":1.23"
+
+    monkeypatch.setattr(window.MainWindow, "_build_handle_token", lambda _self: "tok")
+    fake_gio, fake_glib = _async_portal_fakes(fresh)
+    monkeypatch.setattr(window, "Gio", fake_gio)
+    monkeypatch.setattr(window, "GLib", fake_glib)
+
+    window.MainWindow._on_take_screenshot(self, None)
+
+    assert self._bus is fresh
+    assert stale.async_calls == []
+    assert len(fresh.async_calls) == 1
+    assert self._sender_name == ":1.23"
+
+
 def test_window_take_screenshot_failures(monkeypatch):
     self = FakeWindowSelf()
 
@@ -567,6 +689,40 @@ def test_window_save_uri_success_and_failure(monkeypatch):
     assert self._status_label.text.startswith("Failed: could not load image")
 
 
+def test_window_save_uri_skip_editor_copies_without_editor(monkeypatch, tmp_path):
+    self = FakeWindowSelf()
+    self._bus = DummyBus()
+    self._signal_sub_id = 3
+
+    source = tmp_path / "portal.png"
+    source.write_bytes(b"png-bytes")
+    destination = tmp_path / "Screenshot.png"
+    self._load_config = lambda: {"skip_editor": True}
+    self._build_output_path = lambda _uri: destination
+
+    constructed = []
+    monkeypatch.setattr(window, "_uri_to_local_path", lambda _uri: source)
+    monkeypatch.setattr(
+        window,
+        "AnnotationEditor",
+        lambda *args, **kwargs: constructed.append((args, kwargs)),
+    )
+
+    window.MainWindow._save_uri(self, "file:///portal.png")
+
+    assert destination.read_bytes() == b"png-bytes"
+    assert destination.stat().st_mode & 0o777 == 0o600
+    assert constructed == []
+    assert self._status_label.text == f"Saved: {destination}"
+    assert self._bus.unsubscribe_calls == [3]
+
+    # The fast path keeps the editor's no-clobber contract.
+    self._signal_sub_id = None
+    window.MainWindow._save_uri(self, "file:///portal.png")
+    assert self._status_label.text.startswith("Failed: could not save")
+    assert destination.read_bytes() == b"png-bytes"
+
+
 def test_window_preview_close_request_restores_main_ready_state():
     self = FakeWindowSelf()
     self._preview_window = DummyPreviewWindow()